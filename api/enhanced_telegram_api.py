@@ -8,7 +8,7 @@ import time
 from pathlib import Path
 from typing import Optional, BinaryIO, List
 from queue import Queue, Empty
-from threading import Thread, Lock
+from threading import Thread, Lock, Event
 from core.models import Alert
 
 logger = logging.getLogger(__name__)
@@ -34,6 +34,7 @@ class EnhancedTelegramAPI:
         self.is_queue_active = False
         self.queue_thread: Optional[Thread] = None
         self.queue_lock = Lock()
+        self._queue_stop = Event()
         
         # Statistics
         self.stats = {
@@ -48,6 +49,7 @@ class EnhancedTelegramAPI:
         with self.queue_lock:
             if not self.is_queue_active:
                 self.is_queue_active = True
+                self._queue_stop.clear()
                 self.queue_thread = Thread(target=self._process_queue, daemon=True)
                 self.queue_thread.start()
     
@@ -55,15 +57,24 @@ class EnhancedTelegramAPI:
         """Arrête le worker de queue"""
         with self.queue_lock:
             self.is_queue_active = False
+            self._queue_stop.set()
             if self.queue_thread:
+                # Sentinelle : réveille immédiatement le worker bloqué sur get()
+                self.message_queue.put(None)
                 self.queue_thread.join(timeout=5)
+                self.queue_thread = None
     
     def _process_queue(self):
         """Traite la queue de messages"""
         while self.is_queue_active:
             try:
-                # Récupérer message (timeout 1s)
-                message = self.message_queue.get(timeout=1)
+                # Attente bloquante : pas de réveil périodique quand la queue est vide
+                message = self.message_queue.get()
+                if message is None:
+                    # Sentinelle d'arrêt (ou résidu d'un arrêt précédent)
+                    if not self.is_queue_active:
+                        break
+                    continue
                 
                 # Envoyer avec retry
                 success = self._send_with_retry(
@@ -77,11 +88,9 @@ class EnhancedTelegramAPI:
                 else:
                     self.stats["failed"] += 1
                 
-                # Rate limiting configurable
-                time.sleep(max(0.0, self.message_delay))
+                # Rate limiting configurable (interrompu dès l'arrêt de la queue)
+                self._queue_stop.wait(max(0.0, self.message_delay))
                 
-            except Empty:
-                continue
             except Exception as e:
                 print(f"Erreur traitement queue: {e}")
     
@@ -4,6 +4,9 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 from core.models import BotConfiguration
 
+# Parseur libyaml (C) si disponible, sinon parseur Python
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 class ConfigManager:
     def __init__(self, config_path: str = "config/config.yaml"):
         self.config_path = Path(config_path)
@@ -16,7 +19,7 @@ class ConfigManager:
         if not self.config_exists():
             raise FileNotFoundError(f"Configuration non trouvée : {self.config_path}")
         with open(self.config_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=_YAML_LOADER) or {}
         return self._dict_to_config(data)
     
     def save_config(self, config: BotConfiguration):
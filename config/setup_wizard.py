@@ -5,9 +5,8 @@ from core.models import BotConfiguration
 from config.config_manager import ConfigManager
 
 def print_banner():
-    print("\n" + "="*70)
-    print("🎮 CRYPTO BOT v3.0 - ASSISTANT DE CONFIGURATION")
-    print("="*70 + "\n")
+    separator = "=" * 70
+    sys.stdout.write(f"\n{separator}\n🎮 CRYPTO BOT v3.0 - ASSISTANT DE CONFIGURATION\n{separator}\n\n")
 
 def get_input(prompt: str, default: str = "", required: bool = True) -> str:
     while True:
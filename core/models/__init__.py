@@ -3,12 +3,18 @@ Models - Représentation des données du bot crypto
 VERSION FINALE COMPLÈTE avec TOUS les champs du config.yaml
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
 
+# __slots__ générés par dataclass (Python 3.10+) pour les modèles de marché :
+# un CryptoPrice par point d'historique, on évite un __dict__ par instance.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 class AlertType(Enum):
     """Types d'alertes"""
     PRICE_DROP = "price_drop"
@@ -38,7 +44,7 @@ class PredictionType(Enum):
     BEARISH = "BAISSIER"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CryptoPrice:
     """Prix d'une crypto à un instant T"""
     symbol: str
@@ -85,7 +91,7 @@ class PriceLevel:
         self.trigger_count += 1
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TechnicalIndicators:
     """Indicateurs techniques"""
     rsi: float = 50.0
@@ -115,7 +121,7 @@ class TechnicalIndicators:
             self.resistance = self.resistance_level
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class MarketData:
     """Données complètes du marché"""
     symbol: str
@@ -3,11 +3,17 @@ Modèles de configuration avancés pour les notifications
 Système ultra-paramétrable et compréhensible
 """
 
+import sys
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 from enum import Enum
 
 
+# __slots__ générés par dataclass (Python 3.10+) : les blocs sont instanciés
+# par centaines (blocs × notifications × cryptos), on évite un __dict__ chacun.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 class NotificationTimeSlot(Enum):
     """Créneaux horaires de notification"""
     MATIN = "matin"  # 7h-11h
@@ -17,7 +23,7 @@ class NotificationTimeSlot(Enum):
     NUIT = "nuit"    # 23h-7h
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class NotificationBlock:
     """Configuration d'un bloc d'information dans la notification"""
     enabled: bool = True
@@ -32,7 +38,7 @@ class NotificationBlock:
             self.title = "Information"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PriceBlock(NotificationBlock):
     """Bloc d'affichage du prix"""
     title: str = "💰 Prix actuel"
@@ -50,7 +56,7 @@ class PriceBlock(NotificationBlock):
     message_prix_stable: str = "➡️ Le prix est stable. Le marché hésite."
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PredictionBlock(NotificationBlock):
     """Bloc de prédiction IA"""
     title: str = "🔮 Prédiction Intelligence Artificielle"
@@ -65,7 +71,7 @@ class PredictionBlock(NotificationBlock):
     message_neutre: str = "🤷 L'IA ne voit pas de tendance claire"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class OpportunityBlock(NotificationBlock):
     """Bloc score d'opportunité"""
     title: str = "⭐ Score d'opportunité"
@@ -81,7 +87,7 @@ class OpportunityBlock(NotificationBlock):
     message_faible: str = "⚠️ Opportunité faible, attends peut-être."
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ChartBlock(NotificationBlock):
     """Bloc graphique"""
     title: str = "📊 Évolution du prix"
@@ -100,7 +106,7 @@ class ChartBlock(NotificationBlock):
     })
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class BrokersBlock(NotificationBlock):
     """Bloc comparaison courtiers"""
     title: str = "💱 Où acheter le moins cher"
@@ -112,7 +118,7 @@ class BrokersBlock(NotificationBlock):
     explanation: str = "Compare les prix sur différentes plateformes pour trouver la meilleure offre !"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FearGreedBlock(NotificationBlock):
     """Bloc indice Fear & Greed"""
     title: str = "😨😁 Humeur du marché"
@@ -127,7 +133,7 @@ class FearGreedBlock(NotificationBlock):
     message_extreme_greed: str = "🤑 Avidité extrême ! Attention, les prix peuvent bientôt chuter."
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class GainLossBlock(NotificationBlock):
     """Bloc gain/perte si investissement"""
     title: str = "💵 Si tu avais investi"
@@ -139,7 +145,7 @@ class GainLossBlock(NotificationBlock):
     message_perte: str = "❌ Tu aurais perdu {amount}€ ({percent}%)"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class InvestmentSuggestionBlock(NotificationBlock):
     """🆕 Bloc suggestions d'investissement dans d'autres cryptos"""
     title: str = "💡 Autres cryptos intéressantes"
@@ -163,7 +169,7 @@ class InvestmentSuggestionBlock(NotificationBlock):
     reason_good_prediction: str = "prédiction IA positive"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class GlossaryBlock(NotificationBlock):
     """Bloc glossaire pédagogique"""
     title: str = "📚 Petit glossaire"
@@ -186,7 +192,7 @@ class GlossaryBlock(NotificationBlock):
     })
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CustomMessageBlock(NotificationBlock):
     """Bloc message personnalisé libre"""
     title: str = "📝 Message spécial"
@@ -194,7 +200,7 @@ class CustomMessageBlock(NotificationBlock):
     position: str = "end"  # "start", "end", "after_price", etc.
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScheduledNotificationConfig:
     """Configuration complète d'une notification programmée"""
     
@@ -277,6 +283,20 @@ class ScheduledNotificationConfig:
         return True
 
 
+def format_hours_name(hours: List[int]) -> str:
+    """Nom lisible d'une notification couvrant plusieurs heures"""
+    return f"Notifications ({', '.join(f'{h}h' for h in hours)})"
+
+
+def build_multi_hour_config(hours: List[int], enabled: bool = True) -> ScheduledNotificationConfig:
+    """Crée une seule notification programmée déclenchée à chaque heure donnée"""
+    return ScheduledNotificationConfig(
+        name=format_hours_name(hours),
+        hours=list(hours),
+        enabled=enabled
+    )
+
+
 @dataclass
 class CoinNotificationProfile:
     """Profil de notifications pour une crypto spécifique"""
@@ -354,14 +374,10 @@ class GlobalNotificationSettings:
             enabled=True
         )
         
-        # Créer configuration par défaut
-        for hour in self.default_scheduled_hours:
-            config = ScheduledNotificationConfig(
-                name=f"Notification {hour}h",
-                hours=[hour],
-                enabled=True
-            )
-            profile.add_scheduled_notification(config)
+        # Créer configuration par défaut (une seule config couvrant toutes les heures)
+        profile.add_scheduled_notification(
+            build_multi_hour_config(self.default_scheduled_hours)
+        )
         
         return profile
     
@@ -370,10 +386,4 @@ class GlobalNotificationSettings:
         self.default_scheduled_hours = hours
         for profile in self.coin_profiles.values():
             profile.scheduled_notifications.clear()
-            for hour in hours:
-                config = ScheduledNotificationConfig(
-                    name=f"Notification {hour}h",
-                    hours=[hour],
-                    enabled=True
-                )
-                profile.add_scheduled_notification(config)
+            profile.add_scheduled_notification(build_multi_hour_config(hours))
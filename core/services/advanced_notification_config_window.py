@@ -4,6 +4,7 @@ Interface ultra-intuitive adaptée pour être comprise par un enfant
 """
 
 import copy
+import re
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
@@ -12,9 +13,9 @@ from PyQt6.QtWidgets import (
     QTimeEdit, QListWidget, QListWidgetItem, QMessageBox,
     QDialog, QFormLayout, QColorDialog
 )
-from PyQt6.QtCore import Qt, QTime
-from PyQt6.QtGui import QFont, QColor, QPalette
-from typing import Dict, List, Optional, Any
+from PyQt6.QtCore import Qt, QTime, QRegularExpression
+from PyQt6.QtGui import QFont, QColor, QPalette, QRegularExpressionValidator
+from typing import Callable, Dict, List, Optional, Set, Any
 
 from core.models.notification_config import (
     ScheduledNotificationConfig,
@@ -23,6 +24,75 @@ from core.models.notification_config import (
     PriceBlock, PredictionBlock, OpportunityBlock,
     ChartBlock, BrokersBlock, FearGreedBlock,
     GainLossBlock, InvestmentSuggestionBlock, GlossaryBlock,
+    format_hours_name,
+)
+
+
+# Champs de chaque bloc persistés dans notifications.yaml (ordre conservé)
+_BLOCK_SAVE_FIELDS = (
+    ('price_block', (
+        'enabled', 'show_price_eur', 'show_variation_24h',
+        'show_variation_7d', 'show_volume', 'show_market_cap',
+    )),
+    ('chart_block', ('enabled',)),
+    ('prediction_block', (
+        'enabled', 'show_prediction_type', 'show_confidence', 'min_confidence_to_show',
+    )),
+    ('opportunity_block', (
+        'enabled', 'show_score', 'show_recommendation', 'show_reasons', 'min_score_to_show',
+    )),
+    ('brokers_block', (
+        'enabled', 'title', 'show_best_price', 'show_all_brokers',
+        'show_fees', 'max_brokers_displayed',
+    )),
+    ('fear_greed_block', ('enabled',)),
+    ('gain_loss_block', ('enabled',)),
+    ('investment_suggestions_block', ('enabled',)),
+    ('glossary_block', ('enabled',)),
+)
+
+# Entiers séparés par des virgules ou points-virgules ("24, 168") : un jeton
+# qui n'est pas uniquement composé de chiffres ("12h") est ignoré
+_TIMEFRAME_RE = re.compile(r"(?:^|[,;])\s*(\d+)\s*(?=[,;]|$)")
+
+# Même format imposé à la saisie par Qt (les états intermédiaires comme
+# "24, " restent acceptés pendant la frappe)
+_TIMEFRAME_INPUT_PATTERN = r"\s*\d{1,4}(\s*[,;]\s*\d{1,4})*\s*"
+
+# Polices de titre partagées, créées à la première utilisation (QFont demande
+# une QApplication) : setFont() en prend une copie, l'instance peut être réutilisée
+_BOLD_FONTS: Dict[int, QFont] = {}
+
+
+def _bold_font(point_size: int) -> QFont:
+    """Retourne la police grasse de cette taille, construite une seule fois"""
+    font = _BOLD_FONTS.get(point_size)
+    if font is None:
+        font = QFont()
+        font.setPointSize(point_size)
+        font.setBold(True)
+        _BOLD_FONTS[point_size] = font
+    return font
+
+
+# Feuille de style de la grille d'heures, appliquée une fois au widget parent :
+# chaque bouton ne porte que sa tranche ("period") et, s'il était
+# présélectionné, la propriété "preset" qui active la bordure des heures cochées
+_HOUR_GRID_STYLE = (
+    'QPushButton[period="morning"] { background-color: #FFE4B5; }'
+    ' QPushButton[period="afternoon"] { background-color: #87CEEB; }'
+    ' QPushButton[period="evening"] { background-color: #FFB6C1; }'
+    ' QPushButton[period="night"] { background-color: #4B0082; color: white; }'
+    ' QPushButton[preset="true"]:checked { border: 3px solid green; font-weight: bold; }'
+)
+
+# Feuille de style du compteur d'heures, appliquée une fois : la couleur suit
+# la propriété dynamique "level" au lieu d'une nouvelle feuille à chaque clic
+_COUNTER_STYLE = (
+    'QLabel { font-weight: bold; font-size: 12pt; }'
+    ' QLabel[level="ok"] { color: green; }'
+    ' QLabel[level="warn"] { color: orange; }'
+    ' QLabel[level="alert"] { color: red; }'
 )
 
 
@@ -31,18 +101,17 @@ class SimpleNotificationScheduleWidget(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.selected_hours = [9, 12, 18]  # Horaires par défaut
+        # Ensemble : test d'appartenance direct et pas de doublon (trié par get_hours)
+        self.selected_hours: Set[int] = {9, 12, 18}  # Horaires par défaut
         self._init_ui()
     
     def _init_ui(self):
         layout = QVBoxLayout(self)
+        self.setStyleSheet(_HOUR_GRID_STYLE)
         
         # Titre avec grand emoji
         title = QLabel("🕐 Quand veux-tu recevoir tes notifications ?")
-        title_font = QFont()
-        title_font.setPointSize(14)
-        title_font.setBold(True)
-        title.setFont(title_font)
+        title.setFont(_bold_font(14))
         layout.addWidget(title)
         
         # Description simple
@@ -71,18 +140,18 @@ class SimpleNotificationScheduleWidget(QWidget):
                 
                 # Colorer selon moment de la journée
                 if 7 <= hour < 12:
-                    btn.setStyleSheet("QPushButton { background-color: #FFE4B5; }")  # Matin
+                    btn.setProperty("period", "morning")
                 elif 12 <= hour < 18:
-                    btn.setStyleSheet("QPushButton { background-color: #87CEEB; }")  # Après-midi
+                    btn.setProperty("period", "afternoon")
                 elif 18 <= hour < 23:
-                    btn.setStyleSheet("QPushButton { background-color: #FFB6C1; }")  # Soir
+                    btn.setProperty("period", "evening")
                 else:
-                    btn.setStyleSheet("QPushButton { background-color: #4B0082; color: white; }")  # Nuit
+                    btn.setProperty("period", "night")
                 
                 # Pré-sélectionner les heures par défaut
                 if hour in self.selected_hours:
                     btn.setChecked(True)
-                    btn.setStyleSheet(btn.styleSheet() + " QPushButton:checked { border: 3px solid green; font-weight: bold; }")
+                    btn.setProperty("preset", True)
                 
                 btn.clicked.connect(lambda checked, h=hour: self._toggle_hour(h))
                 self.hour_buttons[hour] = btn
@@ -122,48 +191,52 @@ class SimpleNotificationScheduleWidget(QWidget):
         
         # Compteur
         self.counter_label = QLabel()
+        self.counter_label.setStyleSheet(_COUNTER_STYLE)
         self._update_counter()
         layout.addWidget(self.counter_label)
     
     def _toggle_hour(self, hour: int):
         """Active/désactive une heure"""
         if hour in self.selected_hours:
-            self.selected_hours.remove(hour)
+            self.selected_hours.discard(hour)
         else:
-            self.selected_hours.append(hour)
-        self.selected_hours.sort()
+            self.selected_hours.add(hour)
         self._update_counter()
     
     def set_hours(self, hours: List[int]):
         """Définit les heures sélectionnées"""
-        self.selected_hours = sorted(hours)
+        self.selected_hours = set(hours)
         # Mettre à jour l'affichage
         for hour, btn in self.hour_buttons.items():
-            btn.setChecked(hour in hours)
+            btn.setChecked(hour in self.selected_hours)
         self._update_counter()
     
     def get_hours(self) -> List[int]:
-        """Retourne les heures sélectionnées"""
-        return self.selected_hours
+        """Retourne les heures sélectionnées (triées)"""
+        return sorted(self.selected_hours)
     
     def _update_counter(self):
         """Met à jour le compteur de notifications"""
         count = len(self.selected_hours)
         if count == 0:
             text = "⚠️ Aucune notification ne sera envoyée"
-            color = "red"
+            level = "alert"
         elif count <= 3:
             text = f"✅ {count} notification(s) par jour - Parfait !"
-            color = "green"
+            level = "ok"
         elif count <= 6:
             text = f"⚠️ {count} notifications par jour - Peut-être un peu beaucoup ?"
-            color = "orange"
+            level = "warn"
         else:
             text = f"❗ {count} notifications par jour - Attention, ça fait beaucoup !"
-            color = "red"
+            level = "alert"
         
         self.counter_label.setText(text)
-        self.counter_label.setStyleSheet(f"color: {color}; font-weight: bold; font-size: 12pt;")
+        # Le style n'est recalculé que si le niveau change
+        if self.counter_label.property("level") != level:
+            self.counter_label.setProperty("level", level)
+            self.counter_label.style().unpolish(self.counter_label)
+            self.counter_label.style().polish(self.counter_label)
 
 
 class BlockConfigWidget(QGroupBox):
@@ -316,10 +389,7 @@ class SimpleCoinNotificationEditor(QWidget):
         
         # En-tête avec nom de la crypto
         header = QLabel(f"💎 Configuration des notifications pour {self.symbol}")
-        header_font = QFont()
-        header_font.setPointSize(16)
-        header_font.setBold(True)
-        header.setFont(header_font)
+        header.setFont(_bold_font(16))
         layout.addWidget(header)
         
         # Description
@@ -508,6 +578,10 @@ class SimpleCoinNotificationEditor(QWidget):
             "24, 168",
             tooltip="24 = 1 jour, 168 = 1 semaine, etc."
         )
+        timeframes_edit = block.options["timeframes"]
+        timeframes_edit.setValidator(
+            QRegularExpressionValidator(QRegularExpression(_TIMEFRAME_INPUT_PATTERN), timeframes_edit)
+        )
         
         return block
     
@@ -705,13 +779,7 @@ class SimpleCoinNotificationEditor(QWidget):
             config.chart_block.show_sparklines = chart_widget.get_option_value("show_sparklines")
             config.chart_block.send_full_chart = chart_widget.get_option_value("send_full_chart")
             raw_timeframes = chart_widget.get_option_value("timeframes") or ""
-            timeframes: List[int] = []
-            for part in raw_timeframes.replace(";", ",").split(","):
-                part = part.strip()
-                if part.isdigit():
-                    value = int(part)
-                    if value > 0:
-                        timeframes.append(value)
+            timeframes = [value for value in map(int, _TIMEFRAME_RE.findall(raw_timeframes)) if value > 0]
             config.chart_block.timeframes = timeframes or config.chart_block.timeframes
         
         if "prediction" in self.block_widgets:
@@ -794,13 +862,31 @@ class SimpleCoinNotificationEditor(QWidget):
         base_config.hours = list(default_hours)
         
         profile.default_config = copy.deepcopy(base_config)
-        profile.scheduled_notifications = []
         
-        for hour in default_hours:
-            notif_config = copy.deepcopy(base_config)
-            notif_config.hours = [hour]
-            notif_config.name = f"Notification {hour}h"
-            profile.scheduled_notifications.append(notif_config)
+        # Une seule notification multi-heures : is_active_now() teste déjà config.hours
+        notif_config = copy.deepcopy(base_config)
+        notif_config.name = format_hours_name(default_hours)
+        profile.scheduled_notifications = [notif_config]
+
+
+class _LazyPage(QWidget):
+    """Page d'onglet dont le contenu n'est construit qu'au premier affichage"""
+    
+    def __init__(self, build: Callable[[], QWidget], parent=None):
+        super().__init__(parent)
+        self._build: Optional[Callable[[], QWidget]] = build
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+    
+    def ensure_built(self):
+        """Construit le contenu s'il ne l'a pas encore été"""
+        if self._build is not None:
+            build, self._build = self._build, None
+            self.layout().addWidget(build())
+    
+    def showEvent(self, event):
+        self.ensure_built()
+        super().showEvent(event)
 
 
 class AdvancedNotificationConfigWindow(QDialog):
@@ -811,6 +897,8 @@ class AdvancedNotificationConfigWindow(QDialog):
         self.settings = copy.deepcopy(settings)
         self.symbols = symbols
         self.coin_editors: Dict[str, SimpleCoinNotificationEditor] = {}
+        # Pages des onglets par crypto : chaque éditeur est construit à la première ouverture
+        self._coin_pages: List[_LazyPage] = []
         self.coins_tab: Optional[QTabWidget] = None
         self.schedule_widget: Optional[SimpleNotificationScheduleWidget] = None
         self.global_enabled_checkbox: Optional[QCheckBox] = None
@@ -820,6 +908,9 @@ class AdvancedNotificationConfigWindow(QDialog):
         self.global_quiet_enable_checkbox: Optional[QCheckBox] = None
         self.global_quiet_start_time: Optional[QTimeEdit] = None
         self.global_quiet_end_time: Optional[QTimeEdit] = None
+        # Fenêtre d'aperçu créée au premier clic puis réutilisée
+        self._preview_dialog: Optional[QDialog] = None
+        self._preview_text: Optional[QTextEdit] = None
         self.setWindowTitle("⚙️ Configuration avancée des notifications")
         self.resize(1000, 700)
         self._init_ui()
@@ -829,10 +920,7 @@ class AdvancedNotificationConfigWindow(QDialog):
         
         # Titre
         title = QLabel("🔔 Configure tes notifications comme tu veux !")
-        title_font = QFont()
-        title_font.setPointSize(18)
-        title_font.setBold(True)
-        title.setFont(title_font)
+        title.setFont(_bold_font(18))
         layout.addWidget(title)
         
         # Onglets
@@ -848,9 +936,9 @@ class AdvancedNotificationConfigWindow(QDialog):
         # Onglet 2: Configuration par crypto
         self.coins_tab = QTabWidget()
         for symbol in self.symbols:
-            coin_editor = SimpleCoinNotificationEditor(symbol)
-            self.coin_editors[symbol] = coin_editor
-            self.coins_tab.addTab(coin_editor, f"💎 {symbol}")
+            page = _LazyPage(lambda s=symbol: self._build_coin_editor(s))
+            self._coin_pages.append(page)
+            self.coins_tab.addTab(page, f"💎 {symbol}")
         tabs.addTab(self.coins_tab, "💰 Par crypto")
         
         # Onglet 3: Paramètres globaux
@@ -968,10 +1056,13 @@ class AdvancedNotificationConfigWindow(QDialog):
             end_hour = int(getattr(self.settings, "quiet_end", 7) or 0)
             end_hour = max(0, min(23, end_hour))
             self.global_quiet_end_time.setTime(QTime(end_hour, 0))
-        
-        for symbol, editor in self.coin_editors.items():
-            profile = self.settings.get_coin_profile(symbol)
-            editor.load_from_profile(profile)
+    
+    def _build_coin_editor(self, symbol: str) -> SimpleCoinNotificationEditor:
+        """Construit l'éditeur d'une crypto et y charge son profil"""
+        editor = SimpleCoinNotificationEditor(symbol)
+        editor.load_from_profile(self.settings.get_coin_profile(symbol))
+        self.coin_editors[symbol] = editor
+        return editor
     
     def _collect_settings_from_ui(self):
         """Valide et applique les valeurs saisies aux paramètres"""
@@ -1007,6 +1098,9 @@ class AdvancedNotificationConfigWindow(QDialog):
     def _collect_coin_settings_from_ui(self):
         """Met à jour les profils de notifications à partir des éditeurs."""
         hours = self.settings.default_scheduled_hours or [9]
+        # Les onglets jamais ouverts sont construits depuis leur profil avant d'être appliqués
+        for page in self._coin_pages:
+            page.ensure_built()
         for symbol, editor in self.coin_editors.items():
             profile = self.settings.get_coin_profile(symbol)
             editor.apply_to_profile(profile, hours)
@@ -1046,72 +1140,43 @@ class AdvancedNotificationConfigWindow(QDialog):
             
             # Sauvegarder chaque notification programmée
             for notif in profile.scheduled_notifications:
-                notif_data = {
-                    'name': notif.name,
-                    'enabled': notif.enabled,
-                    'hours': notif.hours,
-                    'days_of_week': notif.days_of_week,
-                    'blocks_order': notif.blocks_order,
-                    'header_message': notif.header_message,
-                    'footer_message': notif.footer_message,
-                    
-                    # Blocs individuels
-                    'price_block': {
-                        'enabled': notif.price_block.enabled,
-                        'show_price_eur': notif.price_block.show_price_eur,
-                        'show_variation_24h': notif.price_block.show_variation_24h,
-                        'show_variation_7d': notif.price_block.show_variation_7d,
-                        'show_volume': notif.price_block.show_volume,
-                        'show_market_cap': notif.price_block.show_market_cap,
-                    },
-                    'chart_block': {
-                        'enabled': notif.chart_block.enabled,
-                    },
-                    'prediction_block': {
-                        'enabled': notif.prediction_block.enabled,
-                        'show_prediction_type': notif.prediction_block.show_prediction_type,
-                        'show_confidence': notif.prediction_block.show_confidence,
-                        'min_confidence_to_show': notif.prediction_block.min_confidence_to_show,
-                    },
-                    'opportunity_block': {
-                        'enabled': notif.opportunity_block.enabled,
-                        'show_score': notif.opportunity_block.show_score,
-                        'show_recommendation': notif.opportunity_block.show_recommendation,
-                        'show_reasons': notif.opportunity_block.show_reasons,
-                        'min_score_to_show': notif.opportunity_block.min_score_to_show,
-                    },
-                    'brokers_block': {
-                        'enabled': notif.brokers_block.enabled,
-                        'title': notif.brokers_block.title,
-                        'show_best_price': notif.brokers_block.show_best_price,
-                        'show_all_brokers': notif.brokers_block.show_all_brokers,
-                        'show_fees': notif.brokers_block.show_fees,
-                        'max_brokers_displayed': notif.brokers_block.max_brokers_displayed,
-                    },
-                    'fear_greed_block': {
-                        'enabled': notif.fear_greed_block.enabled,
-                    },
-                    'gain_loss_block': {
-                        'enabled': notif.gain_loss_block.enabled,
-                    },
-                    'investment_suggestions_block': {
-                        'enabled': notif.investment_suggestions_block.enabled,
-                    },
-                    'glossary_block': {
-                        'enabled': notif.glossary_block.enabled,
-                    }
-                }
-                
+                notif_data = self._notification_to_dict(notif)
                 coin_data['scheduled_notifications'].append(notif_data)
             
             data['coins'][symbol] = coin_data
         
-        # Sauvegarder dans le fichier
-        with open(notif_config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        # Sortie canonique (clés triées) : une config identique donne les mêmes octets
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+        new_bytes = yaml.dump(
+            data, Dumper=dumper, default_flow_style=False, allow_unicode=True, sort_keys=True
+        ).encode('utf-8')
+        
+        # Pas de réécriture (ni de mtime modifié) si rien n'a changé
+        if notif_config_path.exists() and notif_config_path.read_bytes() == new_bytes:
+            print(f"✅ Configuration inchangée ({notif_config_path})")
+            return
+        
+        notif_config_path.write_bytes(new_bytes)
         
         print(f"✅ Configuration COMPLÈTE sauvegardée dans {notif_config_path}")
 
+    @staticmethod
+    def _notification_to_dict(notif: ScheduledNotificationConfig) -> Dict[str, Any]:
+        """Sérialise une notification programmée pour notifications.yaml"""
+        data = {
+            'name': notif.name,
+            'enabled': notif.enabled,
+            'hours': notif.hours,
+            'days_of_week': notif.days_of_week,
+            'blocks_order': notif.blocks_order,
+            'header_message': notif.header_message,
+            'footer_message': notif.footer_message,
+        }
+        # Blocs individuels
+        for attr, fields in _BLOCK_SAVE_FIELDS:
+            block = getattr(notif, attr)
+            data[attr] = {name: getattr(block, name) for name in fields}
+        return data
 
     def _save_to_yaml(self):
         """Sauvegarde dans config/notifications.yaml"""
@@ -1148,8 +1213,8 @@ class AdvancedNotificationConfigWindow(QDialog):
         self._save_to_file()
         super().accept()
     
-    def _preview_notification(self):
-        """Prévisualise une notification"""
+    def _create_preview_dialog(self):
+        """Construit la fenêtre d'aperçu (une seule fois par fenêtre de configuration)"""
         preview_dialog = QDialog(self)
         preview_dialog.setWindowTitle("👁️ Aperçu de notification")
         preview_dialog.resize(600, 800)
@@ -1158,6 +1223,20 @@ class AdvancedNotificationConfigWindow(QDialog):
         
         preview_text = QTextEdit()
         preview_text.setReadOnly(True)
+        layout.addWidget(preview_text)
+        
+        close_btn = QPushButton("Fermer")
+        close_btn.clicked.connect(preview_dialog.close)
+        layout.addWidget(close_btn)
+        
+        self._preview_dialog = preview_dialog
+        self._preview_text = preview_text
+    
+    def _preview_notification(self):
+        """Prévisualise une notification"""
+        if self._preview_dialog is None:
+            self._create_preview_dialog()
+        
         current_symbol = self.symbols[0] if self.symbols else "BTC"
         if self.coins_tab:
             current_index = self.coins_tab.currentIndex()
@@ -1177,7 +1256,7 @@ class AdvancedNotificationConfigWindow(QDialog):
             )
         suggestions_text = "\n".join(suggestion_lines)
 
-        preview_text.setPlainText(
+        self._preview_text.setPlainText(
             f"🔔 Notification du matin - {current_symbol}\n\n"
             "💰 Prix actuel\n"
             f"Le prix actuel est affiché avec une explication simple.\n"
@@ -1196,10 +1275,4 @@ class AdvancedNotificationConfigWindow(QDialog):
             "• Score d'opportunité : Chance d'acheter au bon moment (sur 10)\n\n"
             "ℹ️ Ceci est une information, pas un conseil financier !"
         )
-        layout.addWidget(preview_text)
-        
-        close_btn = QPushButton("Fermer")
-        close_btn.clicked.connect(preview_dialog.close)
-        layout.addWidget(close_btn)
-        
-        preview_dialog.exec()
+        self._preview_dialog.exec()
@@ -1,40 +1,96 @@
 """
 Chart Service - Génération de graphiques pour Telegram
+
+matplotlib est importé au premier graphique généré et non au chargement du
+module : le daemon instancie ce service au démarrage sans forcément tracer.
 """
 
-import matplotlib
-matplotlib.use('Agg')  # Backend non-interactif
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+from __future__ import annotations
+
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from io import BytesIO
+import numpy as np
 from core.models import CryptoPrice, MarketData
+from utils.chart_utils import add_bars, downsample_indices, figure_to_png, price_columns
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 
 class ChartService:
     """Service de génération de graphiques"""
     
-    def __init__(self):
-        plt.style.use('dark_background')
+    def __init__(self, max_points: int = 600):
+        """
+        Args:
+            max_points: Nombre de points au-delà duquel les courbes sont décimées
+        """
+        self.max_points = max_points
+        
+        # Figures réutilisées d'un graphique à l'autre : (lignes, colonnes, taille) -> (fig, axes)
+        self._figures: Dict[Tuple, Tuple[Figure, Tuple]] = {}
+    
+    def _get_figure(self, nrows: int, ncols: int, figsize: Tuple[float, float],
+                    margins: Dict[str, float]) -> Tuple[Figure, Tuple]:
+        """
+        Retourne une figure vierge de la disposition demandée
+        
+        La figure et ses axes sont créés une seule fois puis vidés à chaque
+        réutilisation, ce qui évite de reconstruire figure, canvas et axes
+        pour chaque graphique. Une instance ne doit donc pas générer deux
+        graphiques en même temps (depuis plusieurs threads).
+        
+        Les marges (paramètres de subplots_adjust) sont fixées à la création :
+        aucune passe de mise en page (tight_layout, qui rend la figure pour
+        mesurer les textes) n'est nécessaire avant l'export.
+        """
+        key = (nrows, ncols, figsize)
+        cached = self._figures.get(key)
+        if cached:
+            fig, axes = cached
+            for ax in axes:
+                ax.clear()
+            return fig, axes
+        
+        # Figure rendue directement par Agg : pyplot (état global, détection
+        # du backend interactif) n'est pas nécessaire pour produire un PNG
+        import matplotlib.style
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        
+        matplotlib.style.use('dark_background')
+        fig = Figure(figsize=figsize, facecolor='#1e1e1e')
+        FigureCanvasAgg(fig)
+        axes = tuple(fig.subplots(nrows, ncols, squeeze=False).ravel())
+        fig.subplots_adjust(**margins)
+        self._figures[key] = (fig, axes)
+        return fig, axes
+    
+    def _save_figure(self, fig: Figure) -> BytesIO:
+        """Rend la figure en PNG"""
+        return figure_to_png(fig, '#1e1e1e')
     
     def generate_price_chart(self, symbol: str, prices: List[CryptoPrice], 
                             show_levels: bool = True, 
                             price_levels: dict = None) -> BytesIO:
         """Génère un graphique de prix"""
         
-        fig, ax = plt.subplots(figsize=(12, 6), facecolor='#1e1e1e')
-        ax.set_facecolor('#1e1e1e')
-        
         if not prices:
             return None
         
+        fig, (ax,) = self._get_figure(1, 1, (12, 6),
+                                    dict(left=0.09, right=0.985, top=0.89, bottom=0.13))
+        ax.set_facecolor('#1e1e1e')
+        
         # Données
-        timestamps = [p.timestamp for p in prices]
-        price_values = [p.price_eur for p in prices]
+        columns = price_columns(prices)
+        shown = downsample_indices(columns.prices, self.max_points)
+        dates = columns.dates[shown]
+        price_values = columns.prices[shown]
         
         # Tracer prix
-        ax.plot(timestamps, price_values, linewidth=2, color='#00d9ff', label='Prix')
+        ax.plot(dates, price_values, linewidth=2, color='#00d9ff', label='Prix')
         
         # Niveaux de prix
         if show_levels and price_levels:
@@ -64,18 +120,13 @@ class ChartService:
         ax.tick_params(colors='white')
         
         # Format dates
+        import matplotlib.dates as mdates
+        ax.xaxis_date()
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-        fig.autofmt_xdate()
+        fig.autofmt_xdate(bottom=fig.subplotpars.bottom)
         
         # Sauvegarder
-        buf = BytesIO()
-        plt.tight_layout()
-        plt.savefig(buf, format='png', facecolor='#1e1e1e', 
-                   edgecolor='none', dpi=100)
-        buf.seek(0)
-        plt.close(fig)
-        
-        return buf
+        return self._save_figure(fig)
     
     def generate_indicators_chart(self, market_data: MarketData) -> BytesIO:
         """Génère un graphique multi-indicateurs"""
@@ -83,15 +134,17 @@ class ChartService:
         if not market_data.price_history:
             return None
         
-        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 10), 
-                                            facecolor='#1e1e1e')
+        fig, (ax1, ax2, ax3) = self._get_figure(3, 1, (12, 10),
+                                              dict(left=0.08, right=0.985, top=0.96, bottom=0.08, hspace=0.15))
         
-        timestamps = [p.timestamp for p in market_data.price_history]
-        prices = [p.price_eur for p in market_data.price_history]
+        columns = price_columns(market_data.price_history)
+        shown = downsample_indices(columns.prices, self.max_points)
+        dates = columns.dates[shown]
+        prices = columns.prices[shown]
         
         # 1. Prix
         ax1.set_facecolor('#1e1e1e')
-        ax1.plot(timestamps, prices, linewidth=2, color='#00d9ff', label='Prix')
+        ax1.plot(dates, prices, linewidth=2, color='#00d9ff', label='Prix')
         ax1.set_ylabel('Prix (€)', color='white')
         ax1.set_title(f'{market_data.symbol} - Analyse technique', 
                      color='white', fontsize=16, fontweight='bold')
@@ -101,10 +154,11 @@ class ChartService:
         
         # 2. RSI
         ax2.set_facecolor('#1e1e1e')
-        rsi_values = [market_data.technical_indicators.rsi] * len(timestamps)
-        ax2.plot(timestamps, rsi_values, linewidth=2, color='#ff9500', label='RSI')
-        ax2.axhline(y=70, color='#ff0000', linestyle='--', alpha=0.5)
-        ax2.axhline(y=30, color='#00ff00', linestyle='--', alpha=0.5)
+        # RSI courant (valeur unique) puis seuils 70/30 sur toute la largeur, un artiste chacun
+        ax2.hlines(market_data.technical_indicators.rsi, dates[0], dates[-1],
+                   linewidth=2, color='#ff9500', label='RSI')
+        ax2.hlines([70, 30], 0, 1, transform=ax2.get_yaxis_transform(),
+                   colors=['#ff0000', '#00ff00'], linestyles='--', alpha=0.5)
         ax2.set_ylabel('RSI', color='white')
         ax2.set_ylim(0, 100)
         ax2.legend(loc='upper left', facecolor='#2b2b2b')
@@ -113,8 +167,8 @@ class ChartService:
         
         # 3. Volume
         ax3.set_facecolor('#1e1e1e')
-        volumes = [p.volume_24h for p in market_data.price_history]
-        ax3.bar(timestamps, volumes, color='#00d9ff', alpha=0.5, label='Volume')
+        add_bars(ax3, columns.dates, columns.volumes, width=0.8, colors='#00d9ff', alpha=0.5,
+                 label='Volume')
         ax3.set_xlabel('Temps', color='white')
         ax3.set_ylabel('Volume 24h', color='white')
         ax3.legend(loc='upper left', facecolor='#2b2b2b')
@@ -122,33 +176,28 @@ class ChartService:
         ax3.tick_params(colors='white')
         
         # Format dates
+        import matplotlib.dates as mdates
         for ax in [ax1, ax2, ax3]:
+            ax.xaxis_date()
             ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
         
-        fig.autofmt_xdate()
+        fig.autofmt_xdate(bottom=fig.subplotpars.bottom)
         
         # Sauvegarder
-        buf = BytesIO()
-        plt.tight_layout()
-        plt.savefig(buf, format='png', facecolor='#1e1e1e', 
-                   edgecolor='none', dpi=100)
-        buf.seek(0)
-        plt.close(fig)
-        
-        return buf
+        return self._save_figure(fig)
     
     def generate_comparison_chart(self, markets_data: dict) -> BytesIO:
         """Génère un graphique de comparaison"""
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6), 
-                                       facecolor='#1e1e1e')
+        fig, (ax1, ax2) = self._get_figure(1, 2, (14, 6),
+                                         dict(left=0.06, right=0.98, top=0.93, bottom=0.1, wspace=0.12))
         
         symbols = list(markets_data.keys())
         
         # 1. Changement 24h
         ax1.set_facecolor('#1e1e1e')
-        changes = [markets_data[s].current_price.change_24h for s in symbols]
-        colors = ['#00ff00' if c > 0 else '#ff0000' for c in changes]
+        changes = np.array([markets_data[s].current_price.change_24h for s in symbols], dtype=float)
+        colors = np.where(changes > 0, '#00ff00', '#ff0000')
         ax1.barh(symbols, changes, color=colors, alpha=0.8)
         ax1.set_xlabel('Changement 24h (%)', color='white')
         ax1.set_title('Performance 24h', color='white', fontsize=14, fontweight='bold')
@@ -158,24 +207,16 @@ class ChartService:
         
         # 2. RSI
         ax2.set_facecolor('#1e1e1e')
-        rsi_values = [markets_data[s].technical_indicators.rsi for s in symbols]
-        colors = ['#00ff00' if r < 40 else '#ff0000' if r > 60 else '#ffff00' 
-                 for r in rsi_values]
+        rsi_values = np.array([markets_data[s].technical_indicators.rsi for s in symbols], dtype=float)
+        colors = np.select([rsi_values < 40, rsi_values > 60], ['#00ff00', '#ff0000'], '#ffff00')
         ax2.barh(symbols, rsi_values, color=colors, alpha=0.8)
         ax2.set_xlabel('RSI', color='white')
         ax2.set_title('RSI Comparison', color='white', fontsize=14, fontweight='bold')
         ax2.set_xlim(0, 100)
-        ax2.axvline(x=30, color='#00ff00', linestyle='--', alpha=0.5)
-        ax2.axvline(x=70, color='#ff0000', linestyle='--', alpha=0.5)
+        ax2.vlines([30, 70], 0, 1, transform=ax2.get_xaxis_transform(),
+                   colors=['#00ff00', '#ff0000'], linestyles='--', alpha=0.5)
         ax2.grid(True, alpha=0.2, color='gray', axis='x')
         ax2.tick_params(colors='white')
         
         # Sauvegarder
-        buf = BytesIO()
-        plt.tight_layout()
-        plt.savefig(buf, format='png', facecolor='#1e1e1e', 
-                   edgecolor='none', dpi=100)
-        buf.seek(0)
-        plt.close(fig)
-        
-        return buf
+        return self._save_figure(fig)
@@ -32,13 +32,13 @@ class MarketService:
             return None
         
         price_history = self.binance_api.get_price_history(symbol, interval="1m", limit=200)
-        if symbol not in self.price_history_cache:
-            self.price_history_cache[symbol] = []
+        # Historique local borné à 1000 points, complété en place
+        cached_history = self.price_history_cache.setdefault(symbol, [])
+        cached_history.append(current_price)
+        if len(cached_history) > 1000:
+            del cached_history[:-1000]
         
-        self.price_history_cache[symbol].append(current_price)
-        self.price_history_cache[symbol] = self.price_history_cache[symbol][-1000:]
-        
-        all_prices = price_history + self.price_history_cache[symbol]
+        all_prices = price_history + cached_history
         technical_indicators = self.binance_api.calculate_technical_indicators(all_prices)
         
         funding_rate = self.binance_api.get_funding_rate(symbol)
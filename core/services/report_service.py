@@ -161,10 +161,10 @@ class ReportService:
         return self._detail_level() == "simple"
 
     def _coin_option(self, symbol: str, key: str, default):
-        if not self.config or not getattr(self.config, "coin_settings", None):
-            return default
-        symbol_key = symbol.upper()
-        return self.config.coin_settings.get(symbol_key, {}).get(key, default)
+        # Une seule recherche par appel, sans dict vide temporaire (cf. SummaryService)
+        coin_settings = getattr(self.config, "coin_settings", None) if self.config else None
+        settings = coin_settings.get(symbol.upper()) if coin_settings else None
+        return settings.get(key, default) if settings else default
 
     def _include_symbol_report(self, symbol: str) -> bool:
         if not self._coin_option(symbol, "include_report", True):
@@ -179,8 +179,7 @@ class ReportService:
     def _coin_settings_dict(self, symbol: str) -> Dict[str, Any]:
         if not self.config or not getattr(self.config, "coin_settings", None):
             return {}
-        symbol_key = symbol.upper()
-        return self.config.coin_settings.get(symbol_key, {}) or {}
+        return self.config.coin_settings.get(symbol.upper()) or {}
 
     def _notification_content_config(self, symbol: str) -> Dict[str, Any]:
         if not self.config or not getattr(self.config, "notification_content_by_coin", None):
@@ -18,9 +18,11 @@ class SummaryService:
     # Helpers per-coin
     # ------------------------------------------------------------------
     def _coin_option(self, symbol: str, key: str, default):
-        if not self.config or not getattr(self.config, "coin_settings", None):
-            return default
-        return self.config.coin_settings.get(symbol, {}).get(key, default)
+        # Appelée plusieurs fois par crypto et par résumé : une seule recherche
+        # dans coin_settings, sans dict vide temporaire pour les cryptos non réglées
+        coin_settings = getattr(self.config, "coin_settings", None) if self.config else None
+        settings = coin_settings.get(symbol) if coin_settings else None
+        return settings.get(key, default) if settings else default
 
     def _include_symbol_summary(self, symbol: str) -> bool:
         return self._coin_option(symbol, "include_summary", True)
@@ -3,10 +3,12 @@ Daemon Service - Exécution en arrière-plan avec gestion d'erreurs robuste
 FIXED: Imports timezone, signal handlers thread-safe, méthode _dict_to_notification_settings
 """
 
+import copy
+import mmap
 import time
 import signal
 from datetime import datetime, timezone  # FIXED: Problème 1 - Import simple de timezone
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from threading import Event, Lock
 import yaml
 from pathlib import Path
@@ -37,9 +39,13 @@ from core.models.notification_config import (
     InvestmentSuggestionBlock,
     GlossaryBlock,
     CustomMessageBlock,
+    build_multi_hour_config,
 )
 from utils.formatters import SafeHTMLFormatter
 
+# Parseur libyaml (C) si disponible, sinon parseur Python
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class DaemonService:
     def __init__(self, config: BotConfiguration):
@@ -94,8 +100,13 @@ class DaemonService:
         
         if Path(notif_config_path).exists():
             try:
-                with open(notif_config_path, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
+                with open(notif_config_path, 'rb') as f:
+                    if Path(notif_config_path).stat().st_size == 0:
+                        data = {}
+                    else:
+                        # Lecture via la page cache, sans copie intermédiaire du fichier
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            data = yaml.load(mm, Loader=_YAML_LOADER) or {}
                 return self._dict_to_notification_settings(data)
             except Exception as e:
                 self.logger.error(f"Erreur chargement notifications: {e}")
@@ -235,6 +246,29 @@ class DaemonService:
 
             return cfg
 
+        def _freeze(value):
+            if isinstance(value, dict):
+                return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+            if isinstance(value, (list, tuple)):
+                return tuple(_freeze(v) for v in value)
+            return value
+
+        # Les cryptos partagent souvent la même config (valeurs par défaut) :
+        # on construit chaque modèle une seule fois et on en distribue des copies.
+        config_templates: Dict[Tuple, ScheduledNotificationConfig] = {}
+
+        def _cached_notification_config(config_data: Optional[Dict[str, Any]], fallback_hours: List[int]) -> ScheduledNotificationConfig:
+            try:
+                key = (_freeze(config_data), tuple(fallback_hours))
+                hash(key)
+            except TypeError:
+                return _build_notification_config(config_data, fallback_hours)
+            template = config_templates.get(key)
+            if template is None:
+                template = _build_notification_config(config_data, fallback_hours)
+                config_templates[key] = template
+            return copy.deepcopy(template)
+
         notif_data = data.get('notifications', data or {})
 
         hours = _normalize_hours(notif_data.get('default_scheduled_hours', [9, 12, 18])) or [9, 12, 18]
@@ -277,20 +311,16 @@ class DaemonService:
                     for sched_cfg in scheduled_configs:
                         if not isinstance(sched_cfg, dict):
                             continue
-                        notification_config = _build_notification_config(sched_cfg, hours)
+                        notification_config = _cached_notification_config(sched_cfg, hours)
                         profile.add_scheduled_notification(notification_config)
                 else:
-                    for hour in hours:
-                        default_config = ScheduledNotificationConfig(
-                            name=f"Notification {hour}h",
-                            hours=[hour],
-                            enabled=profile.enabled
-                        )
-                        profile.add_scheduled_notification(default_config)
+                    profile.add_scheduled_notification(
+                        build_multi_hour_config(hours, enabled=profile.enabled)
+                    )
 
                 default_config_data = coin_cfg.get('default_config')
                 if isinstance(default_config_data, dict):
-                    profile.default_config = _build_notification_config(default_config_data, hours)
+                    profile.default_config = _cached_notification_config(default_config_data, hours)
 
                 settings.coin_profiles[symbol] = profile
 
@@ -466,14 +496,16 @@ class DaemonService:
     def _check_cycle(self):
         """Effectue un cycle de vérification - N'ENVOIE QUE LES NOTIFICATIONS CONFIGURÉES"""
         try:
-            current_hour = datetime.now(timezone.utc).hour
-            current_day = datetime.now(timezone.utc).weekday()
+            # Une seule lecture de l'horloge : heure et jour restent cohérents (passage de minuit)
+            now = datetime.now(timezone.utc)
+            current_hour = now.hour
+            current_day = now.weekday()
             
             # Vérifier si c'est l'heure d'envoyer un résumé
             should_send_summary = False
             if current_hour in self.config.summary_hours:
                 if self.last_summary_sent is None or \
-                   (datetime.now(timezone.utc) - self.last_summary_sent).total_seconds() > 3000:
+                   (now - self.last_summary_sent).total_seconds() > 3000:
                     should_send_summary = True
             
             if not should_send_summary:
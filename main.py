@@ -1,9 +1,11 @@
 import argparse
+import io
 import sys
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
 
 from config.config_manager import ConfigManager
-from core.models import BotConfiguration
+from core.models import AlertLevel, BotConfiguration
 from utils.logger import setup_logger
 
 
@@ -45,65 +47,104 @@ def run_daemon_mode(config: BotConfiguration) -> None:
         sys.exit(1)
 
 
+def _init_services(config: BotConfiguration) -> Dict[str, Any]:
+    """Instancie les services utilisés par le mode 'once'."""
+    from api.binance_api import BinanceAPI
+    from api.telegram_api import TelegramAPI
+    from core.services.market_service import MarketService
+    from core.services.alert_service import AlertService
+
+    binance_api = BinanceAPI()
+    return {
+        "binance_api": binance_api,
+        "telegram_api": TelegramAPI(config.telegram_bot_token, config.telegram_chat_id),
+        "market_service": MarketService(binance_api),
+        "alert_service": AlertService(config),
+    }
+
+
+def _analyze_symbol(sym: str, market_service):
+    """Récupère et analyse une crypto (exécuté dans un thread du pool)."""
+    market_data = market_service.get_market_data(sym)
+    if not market_data:
+        return None
+
+    prediction = market_service.predict_price_movement(market_data)
+    opportunity = market_service.calculate_opportunity_score(market_data, prediction)
+    return market_data, prediction, opportunity
+
+
+def _process_symbol(sym: str, analysis: Future, alert_service, telegram_api) -> str:
+    """Termine le traitement d'une crypto analysée et renvoie le rapport texte.
+
+    Appelée depuis le thread principal, dans l'ordre des symboles : les
+    alertes (état partagé d'AlertService, session Telegram) ne sont jamais
+    traitées en parallèle et partent dans un ordre déterministe.
+    """
+    buf = io.StringIO()
+    buf.write(f"\n📊 {sym}:\n")
+    buf.write("-" * 60 + "\n")
+    try:
+        result = analysis.result()
+        if result is None:
+            buf.write("❌ Données indisponibles\n")
+            return buf.getvalue()
+
+        market_data, prediction, opportunity = result
+
+        buf.write(
+            f"💰 Prix: {market_data.current_price.price_eur:.2f} €\n"
+            f"📈 Change 24h: {market_data.current_price.change_24h:+.2f}%\n"
+            f"🎯 RSI: {market_data.technical_indicators.rsi:.0f}\n"
+            f"\n🔮 Prédiction: {prediction.prediction_type.value}\n"
+            f"   Confiance: {prediction.confidence}%\n"
+            f"\n⭐ Score: {opportunity.score}/10\n"
+            f"   {opportunity.recommendation}\n"
+        )
+
+        if opportunity.reasons:
+            buf.write("\n💡 Raisons:\n")
+            for reason in opportunity.reasons[:3]:
+                buf.write(f"   • {reason}\n")
+
+        alerts = alert_service.check_alerts(market_data, prediction)
+        if alerts:
+            buf.write(f"\n🚨 Alertes ({len(alerts)}):\n")
+            for alert in alerts:
+                buf.write(f"   • [{alert.alert_level.value.upper()}] {alert.message}\n")
+                if alert.alert_level in [AlertLevel.IMPORTANT, AlertLevel.CRITICAL]:
+                    telegram_api.send_alert(alert)
+        else:
+            buf.write("\nℹ️ Aucune alerte\n")
+    except Exception as exc:
+        buf.write(f"❌ Erreur: {exc}\n")
+    return buf.getvalue()
+
+
 def run_once_mode(config: BotConfiguration, symbol: Optional[str] = None) -> None:
     """Effectue une vérification unique depuis la ligne de commande."""
     try:
-        from api.binance_api import BinanceAPI
-        from api.telegram_api import TelegramAPI
-        from core.services.market_service import MarketService
-        from core.services.alert_service import AlertService
-        from core.models import AlertLevel
+        services = _init_services(config)
     except ImportError as exc:
         print(f"❌ Mode 'once' indisponible: {exc}")
         sys.exit(1)
 
-    print("\n" + "=" * 60)
-    print("🔍 VÉRIFICATION UNIQUE")
-    print("=" * 60 + "\n")
+    sys.stdout.write(f"\n{'=' * 60}\n🔍 VÉRIFICATION UNIQUE\n{'=' * 60}\n\n")
 
-    binance_api = BinanceAPI()
-    telegram_api = TelegramAPI(config.telegram_bot_token, config.telegram_chat_id)
-    market_service = MarketService(binance_api)
-    alert_service = AlertService(config)
+    telegram_api = services["telegram_api"]
+    market_service = services["market_service"]
+    alert_service = services["alert_service"]
 
     symbols = [symbol] if symbol else config.crypto_symbols
 
-    for sym in symbols:
-        print(f"\n📊 {sym}:")
-        print("-" * 60)
-        try:
-            market_data = market_service.get_market_data(sym)
-            if not market_data:
-                print("❌ Données indisponibles")
-                continue
-
-            prediction = market_service.predict_price_movement(market_data)
-            opportunity = market_service.calculate_opportunity_score(market_data, prediction)
-
-            print(f"💰 Prix: {market_data.current_price.price_eur:.2f} €")
-            print(f"📈 Change 24h: {market_data.current_price.change_24h:+.2f}%")
-            print(f"🎯 RSI: {market_data.technical_indicators.rsi:.0f}")
-            print(f"\n🔮 Prédiction: {prediction.prediction_type.value}")
-            print(f"   Confiance: {prediction.confidence}%")
-            print(f"\n⭐ Score: {opportunity.score}/10")
-            print(f"   {opportunity.recommendation}")
-
-            if opportunity.reasons:
-                print("\n💡 Raisons:")
-                for reason in opportunity.reasons[:3]:
-                    print(f"   • {reason}")
-
-            alerts = alert_service.check_alerts(market_data, prediction)
-            if alerts:
-                print(f"\n🚨 Alertes ({len(alerts)}):")
-                for alert in alerts:
-                    print(f"   • [{alert.alert_level.value.upper()}] {alert.message}")
-                    if alert.alert_level in [AlertLevel.IMPORTANT, AlertLevel.CRITICAL]:
-                        telegram_api.send_alert(alert)
-            else:
-                print("\nℹ️ Aucune alerte")
-        except Exception as exc:
-            print(f"❌ Erreur: {exc}")
+    # Récupération et analyse sont indépendantes et surtout liées au réseau :
+    # on recouvre les latences. Alertes et affichage restent faits ici, dans
+    # l'ordre des symboles.
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(symbols)))) as executor:
+        analyses = [executor.submit(_analyze_symbol, sym, market_service) for sym in symbols]
+        for sym, analysis in zip(symbols, analyses):
+            sys.stdout.write(_process_symbol(sym, analysis, alert_service, telegram_api))
+            sys.stdout.flush()
     print("\n" + "=" * 60 + "\n")
 
 
@@ -113,11 +154,13 @@ def setup_wizard() -> BotConfiguration:
 
     print("\n🎮 ASSISTANT DE CONFIGURATION\n")
     config = run_setup_wizard()
-    print("\n✅ Configuration terminée!")
-    print("\nCommandes:")
-    print("  python main.py              # GUI")
-    print("  python main.py --daemon     # Démon")
-    print("  python main.py --once       # Test\n")
+    sys.stdout.write(
+        "\n✅ Configuration terminée!\n"
+        "\nCommandes:\n"
+        "  python main.py              # GUI\n"
+        "  python main.py --daemon     # Démon\n"
+        "  python main.py --once       # Test\n\n"
+    )
     return config
 
 
@@ -151,13 +194,16 @@ def main() -> None:
     )
     logger.info("Configuration chargée depuis %s", args.config)
 
-    print("\n" + "=" * 60)
-    print("🚀 CRYPTO BOT v3.0 PyQt6")
-    print("=" * 60)
-    print("=" * 60)
-    print(f"Cryptos: {', '.join(config.crypto_symbols)}")
-    print(f"Intervalle: {config.check_interval_seconds}s")
-    print("=" * 60 + "\n")
+    separator = "=" * 60
+    sys.stdout.write(
+        f"\n{separator}\n"
+        "🚀 CRYPTO BOT v3.0 PyQt6\n"
+        f"{separator}\n"
+        f"{separator}\n"
+        f"Cryptos: {', '.join(config.crypto_symbols)}\n"
+        f"Intervalle: {config.check_interval_seconds}s\n"
+        f"{separator}\n\n"
+    )
 
     if args.once:
         run_once_mode(config, args.symbol)
@@ -4,12 +4,133 @@ Backtesting Engine - Test de stratégies sur données historiques
 
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional, Callable
-from datetime import datetime, timedelta, timezone, timezone
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Callable, Tuple
+from datetime import datetime, timedelta, timezone, tzinfo
 from dataclasses import dataclass, field
 
 from core.models import CryptoPrice, MarketData, TechnicalIndicators
 
+try:
+    from numba import njit
+except ImportError:  # numba optionnel : le noyau tourne alors en Python pur
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Codes des ordres produits par le noyau de simulation
+_SIDE_BUY = 1
+_SIDE_SELL = -1
+_SIDE_FINAL_SELL = -2
+
+# Journal des trades : un enregistrement par ordre, matérialisé en BacktestTrade à la demande
+_TRADE_DTYPE = np.dtype([
+    ('ts_ns', np.int64),  # ns depuis l'epoch
+    ('side', np.int8),
+    ('price', np.float64),
+    ('amount', np.float64),
+    ('total', np.float64),
+    ('fee', np.float64),
+    ('reason', object),
+])
+
+
+# Signature typée (tableaux C-contigus) : une seule spécialisation compilée
+@njit("(float64[::1], int8[::1], float64, float64)", cache=True)
+def _simulate_kernel(prices, signals, cash0, fee_pct):
+    """
+    Simule la stratégie « tout le cash / toute la position » barre par barre
+    
+    signals[i] vaut 1 (achat), -1 (vente) ou 0. Retourne les courbes
+    (équité, cash, valeur de position) et le journal des ordres
+    (barre, sens, quantité, montant, frais). Une position encore ouverte
+    est soldée au dernier prix, ce qui ajoute un point à la courbe.
+    """
+    n = prices.shape[0]
+    fee_rate = fee_pct / 100
+    
+    equity = np.empty(n + 1)
+    cash_curve = np.empty(n + 1)
+    position_curve = np.empty(n + 1)
+    trade_bars = np.empty(n + 1, dtype=np.int64)
+    trade_sides = np.empty(n + 1, dtype=np.int8)
+    trade_amounts = np.empty(n + 1)
+    trade_totals = np.empty(n + 1)
+    trade_fees = np.empty(n + 1)
+    n_trades = 0
+    
+    cash = cash0
+    position = 0.0
+    for i in range(n):
+        price = prices[i]
+        signal = signals[i]
+        if signal == 1 and cash > 0:
+            # Acheter avec tout le cash (frais inclus)
+            amount = cash / price
+            total = amount * price
+            fee = total * fee_rate
+            cost = total + fee
+            if cost > cash:
+                amount = (cash / (1 + fee_rate)) / price
+                total = amount * price
+                fee = total * fee_rate
+                cost = total + fee
+            if cost > 0 and amount > 0:
+                cash -= cost
+                position += amount
+                trade_bars[n_trades] = i
+                trade_sides[n_trades] = 1
+                trade_amounts[n_trades] = amount
+                trade_totals[n_trades] = total
+                trade_fees[n_trades] = fee
+                n_trades += 1
+        elif signal == -1 and position > 0:
+            # Vendre toute la position
+            amount = position
+            total = amount * price
+            fee = total * fee_rate
+            cash += total - fee
+            position -= amount
+            trade_bars[n_trades] = i
+            trade_sides[n_trades] = -1
+            trade_amounts[n_trades] = amount
+            trade_totals[n_trades] = total
+            trade_fees[n_trades] = fee
+            n_trades += 1
+        
+        position_value = position * price
+        equity[i] = cash + position_value
+        cash_curve[i] = cash
+        position_curve[i] = position_value
+    
+    n_points = n
+    if position > 0 and n > 0:
+        price = prices[n - 1]
+        amount = position
+        total = amount * price
+        fee = total * fee_rate
+        cash += total - fee
+        position -= amount
+        trade_bars[n_trades] = n - 1
+        trade_sides[n_trades] = -2
+        trade_amounts[n_trades] = amount
+        trade_totals[n_trades] = total
+        trade_fees[n_trades] = fee
+        n_trades += 1
+        
+        position_value = position * price
+        equity[n] = cash + position_value
+        cash_curve[n] = cash
+        position_curve[n] = position_value
+        n_points = n + 1
+    
+    return (equity[:n_points], cash_curve[:n_points], position_curve[:n_points],
+            trade_bars[:n_trades], trade_sides[:n_trades], trade_amounts[:n_trades],
+            trade_totals[:n_trades], trade_fees[:n_trades])
+
 
 @dataclass
 class BacktestTrade:
@@ -63,10 +184,26 @@ class BacktestResult:
     avg_loss: float = 0.0
     profit_factor: float = 0.0
     
-    # Données détaillées
-    trades: List[BacktestTrade] = field(default_factory=list)
-    equity_curve: List[Dict] = field(default_factory=list)
+    # Données détaillées (journal des trades et courbe d'équité en colonnes,
+    # horodatages en ns depuis l'epoch, fuseau `tz` appliqué à la sérialisation)
+    trade_log: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=_TRADE_DTYPE))
+    equity_timestamps: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    equity_values: np.ndarray = field(default_factory=lambda: np.empty(0))
+    equity_cash: np.ndarray = field(default_factory=lambda: np.empty(0))
+    equity_position_value: np.ndarray = field(default_factory=lambda: np.empty(0))
     parameters: Dict = field(default_factory=dict)
+    tz: Optional[tzinfo] = None
+    
+    @property
+    def trades(self) -> List[BacktestTrade]:
+        """Trades sous forme de BacktestTrade (construits à la demande)"""
+        return _trade_objects(self.trade_log, self.tz)
+    
+    @property
+    def equity_curve(self) -> List[Dict]:
+        """Courbe d'équité au format liste de dicts (construite à la demande)"""
+        return _equity_records(self.equity_timestamps, self.tz, self.equity_values,
+                               self.equity_cash, self.equity_position_value)
     
     def to_dict(self) -> Dict:
         return {
@@ -95,6 +232,96 @@ class BacktestResult:
         }
 
 
+def _trade_objects(trade_log: np.ndarray, tz: Optional[tzinfo]) -> List[BacktestTrade]:
+    """Matérialise le journal des trades en objets BacktestTrade"""
+    timestamps = _ns_to_datetimes(trade_log['ts_ns'], tz)
+    return [
+        BacktestTrade(
+            timestamp=ts,
+            symbol="BTC",  # Simplifié
+            action='BUY' if side == _SIDE_BUY else 'SELL',
+            price=price,
+            amount=amount,
+            total=total,
+            fee=fee,
+            reason=reason
+        )
+        for ts, side, price, amount, total, fee, reason in zip(
+            timestamps, trade_log['side'].tolist(), trade_log['price'].tolist(),
+            trade_log['amount'].tolist(), trade_log['total'].tolist(),
+            trade_log['fee'].tolist(), trade_log['reason'].tolist()
+        )
+    ]
+
+
+def _timestamps_to_ns(timestamps) -> np.ndarray:
+    """Convertit des datetimes en int64 ns depuis l'epoch (naïfs lus comme UTC)"""
+    return pd.to_datetime(list(timestamps), utc=True).as_unit('ns').asi8
+
+
+def _ns_to_datetimes(timestamps_ns: np.ndarray, tz: Optional[tzinfo]) -> np.ndarray:
+    """Reconstruit les datetimes (dans le fuseau tz, ou naïfs si None)"""
+    index = pd.to_datetime(timestamps_ns, utc=True)
+    index = index.tz_localize(None) if tz is None else index.tz_convert(tz)
+    return index.to_pydatetime()
+
+
+def _equity_records(timestamps_ns, tz, equity, cash, position_value) -> List[Dict]:
+    """Convertit les colonnes de la courbe d'équité en liste de dicts"""
+    return [
+        {
+            'timestamp': ts.isoformat(),
+            'equity': eq,
+            'cash': c,
+            'position_value': pv
+        }
+        for ts, eq, c, pv in zip(_ns_to_datetimes(timestamps_ns, tz), equity.tolist(),
+                                 cash.tolist(), position_value.tolist())
+    ]
+
+
+# État d'un processus de sweep : stratégie compilée une fois par worker
+_SWEEP_STATE: Dict = {}
+
+
+def _init_sweep_worker(initial_capital: float, fee_pct: float, prices: List[CryptoPrice],
+                       strategy: Callable, strategy_name: str, symbol: str):
+    """Initialise un worker de sweep avec les données communes à tous les jobs"""
+    engine = BacktestEngine(initial_capital, fee_pct)
+    _SWEEP_STATE['run'] = engine.compile_strategy(prices, strategy, strategy_name, symbol)
+
+
+def _run_sweep_job(parameters: Dict) -> BacktestResult:
+    """Exécute un backtest du sweep dans le worker courant"""
+    return _SWEEP_STATE['run'](parameters)
+
+
+class _PriceHistoryView(Sequence):
+    """Vue en lecture seule sur prices[:stop], sans copie de la liste"""
+    
+    __slots__ = ('_prices', '_stop')
+    
+    def __init__(self, prices: List[CryptoPrice], stop: int):
+        self._prices = prices
+        self._stop = stop
+    
+    def __len__(self) -> int:
+        return self._stop
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._prices[i] for i in range(*index.indices(self._stop))]
+        if index < 0:
+            index += self._stop
+        if not 0 <= index < self._stop:
+            raise IndexError("index hors de l'historique")
+        return self._prices[index]
+    
+    def __iter__(self):
+        for i in range(self._stop):
+            yield self._prices[i]
+
+
 class BacktestEngine:
     """Moteur de backtesting"""
     
@@ -113,18 +340,80 @@ class BacktestEngine:
         self.position_value = 0.0
         self.equity = initial_capital
         
-        # Historique
-        self.trades: List[BacktestTrade] = []
-        self.equity_curve: List[Dict] = []
+        # Historique (horodatages en ns, fuseau du premier horodatage enregistré)
+        self._tz: Optional[tzinfo] = None
+        self._reset_trade_log()
+        self._reset_equity_columns()
+        
+        # Données du backtest en cours (indexées par barre)
+        self._prices: List[CryptoPrice] = []
+        self._rsi: Optional[np.ndarray] = None
+        self._ma20: Optional[np.ndarray] = None
+        self._ma50: Optional[np.ndarray] = None
         
-    def reset(self):
-        """Réinitialise l'état du backtest"""
+    def reset(self, n_bars: int = 0):
+        """
+        Réinitialise l'état du backtest
+        
+        Args:
+            n_bars: Nombre de barres attendues (colonnes d'équité préallouées)
+        """
         self.cash = self.initial_capital
         self.position_size = 0.0
         self.position_value = 0.0
         self.equity = self.initial_capital
-        self.trades = []
-        self.equity_curve = []
+        self._tz = None
+        self._reset_trade_log()
+        self._reset_equity_columns(n_bars)
+        self._prices = []
+        self._rsi = None
+        self._ma20 = None
+        self._ma50 = None
+    
+    def _reset_trade_log(self, capacity: int = 0):
+        """(Ré)alloue le journal des trades"""
+        self._trade_log = np.empty(capacity, dtype=_TRADE_DTYPE)
+        self._n_trades = 0
+    
+    @property
+    def trades(self) -> List[BacktestTrade]:
+        """Trades exécutés sous forme de BacktestTrade (construits à la demande)"""
+        return _trade_objects(self._trade_log[:self._n_trades], self._tz)
+    
+    def _timestamp_ns(self, timestamp: datetime) -> int:
+        """Horodatage en ns ; le premier enregistré fixe le fuseau de sérialisation"""
+        if self._n_trades == 0 and self._eq_len == 0:
+            self._tz = timestamp.tzinfo
+        return pd.Timestamp(timestamp).value
+    
+    def _record_trade(self, timestamp: datetime, side: int, price: float, amount: float,
+                      total: float, fee: float, reason: str):
+        """Ajoute un ordre au journal des trades"""
+        n = self._n_trades
+        if n == len(self._trade_log):
+            # Capacité doublée : ajout en O(1) amorti
+            grown = np.empty(max(16, 2 * n), dtype=_TRADE_DTYPE)
+            grown[:n] = self._trade_log[:n]
+            self._trade_log = grown
+        
+        self._trade_log[n] = (self._timestamp_ns(timestamp), side, price, amount,
+                              total, fee, reason)
+        self._n_trades = n + 1
+    
+    def _reset_equity_columns(self, capacity: int = 0):
+        """(Ré)alloue les colonnes de la courbe d'équité"""
+        self._eq_ts = np.empty(capacity, dtype=np.int64)  # ns depuis l'epoch
+        self._eq_equity = np.empty(capacity)
+        self._eq_cash = np.empty(capacity)
+        self._eq_pos = np.empty(capacity)
+        self._eq_len = 0
+    
+    @property
+    def equity_curve(self) -> List[Dict]:
+        """Courbe d'équité au format liste de dicts (construite à la demande)"""
+        n = self._eq_len
+        return _equity_records(self._eq_ts[:n], self._tz, self._eq_equity[:n],
+                               self._eq_cash[:n], self._eq_pos[:n])
     
     def buy(self, price: float, amount: float, timestamp: datetime, reason: str = ""):
         """Exécute un achat"""
@@ -145,17 +434,7 @@ class BacktestEngine:
         self.cash -= cost
         self.position_size += amount
         
-        trade = BacktestTrade(
-            timestamp=timestamp,
-            symbol="BTC",  # Simplifié
-            action="BUY",
-            price=price,
-            amount=amount,
-            total=total,
-            fee=fee,
-            reason=reason
-        )
-        self.trades.append(trade)
+        self._record_trade(timestamp, _SIDE_BUY, price, amount, total, fee, reason)
     
     def sell(self, price: float, amount: Optional[float] = None, 
             timestamp: Optional[datetime] = None, reason: str = ""):
@@ -174,29 +453,29 @@ class BacktestEngine:
         self.cash += proceeds
         self.position_size -= amount
         
-        trade = BacktestTrade(
-            timestamp=timestamp or datetime.now(timezone.utc),
-            symbol="BTC",
-            action="SELL",
-            price=price,
-            amount=amount,
-            total=total,
-            fee=fee,
-            reason=reason
-        )
-        self.trades.append(trade)
+        self._record_trade(timestamp or datetime.now(timezone.utc), _SIDE_SELL,
+                           price, amount, total, fee, reason)
     
     def update_equity(self, current_price: float, timestamp: datetime):
         """Met à jour l'équité"""
         self.position_value = self.position_size * current_price
         self.equity = self.cash + self.position_value
         
-        self.equity_curve.append({
-            'timestamp': timestamp.isoformat(),
-            'equity': self.equity,
-            'cash': self.cash,
-            'position_value': self.position_value
-        })
+        n = self._eq_len
+        if n == len(self._eq_equity):
+            # Capacité doublée : ajout en O(1) amorti
+            capacity = max(16, 2 * n)
+            for name in ('_eq_ts', '_eq_equity', '_eq_cash', '_eq_pos'):
+                column = getattr(self, name)
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[:n] = column[:n]
+                setattr(self, name, grown)
+        
+        self._eq_ts[n] = self._timestamp_ns(timestamp)
+        self._eq_equity[n] = self.equity
+        self._eq_cash[n] = self.cash
+        self._eq_pos[n] = self.position_value
+        self._eq_len = n + 1
     
     def run_backtest(self, 
                     prices: List[CryptoPrice],
@@ -210,6 +489,8 @@ class BacktestEngine:
         Args:
             prices: Historique des prix
             strategy: Fonction de stratégie qui retourne 'BUY', 'SELL' ou 'HOLD'
+                (ou, si strategy.vectorized, un tableau de signaux +1/0/-1
+                calculé en un appel sur les prix et indicateurs complets)
             strategy_name: Nom de la stratégie
             symbol: Symbole de la crypto
             parameters: Paramètres de la stratégie
@@ -222,95 +503,283 @@ class BacktestEngine:
         if not prices or len(prices) < 2:
             return self._create_empty_result(strategy_name, symbol)
         
-        start_date = prices[0].timestamp
-        end_date = prices[-1].timestamp
+        series = self._prepare_series(prices)
+        return self._run_prepared(series, strategy, strategy_name, symbol, parameters or {})
+    
+    @classmethod
+    def _prepare_series(cls, prices: List[CryptoPrice]) -> Dict:
+        """
+        Prépare les séries communes à tous les backtests sur ces prix
         
-        # Simuler le trading
-        for i, price_data in enumerate(prices):
-            current_price = price_data.price_eur
-            timestamp = price_data.timestamp
-            
+        Prix et horodatages en colonnes, indicateurs calculés une seule fois
+        sur toute la série (O(N) au lieu de O(N²)). Réutilisable tel quel
+        par plusieurs backtests (sweeps).
+        """
+        prices_arr = np.fromiter((p.price_eur for p in prices), dtype=float, count=len(prices))
+        return {
+            'prices': prices,
+            'prices_arr': prices_arr,
+            'timestamps_ns': _timestamps_to_ns(p.timestamp for p in prices),
+            'tz': prices[0].timestamp.tzinfo,
+            'indicators': cls._precompute_indicators(prices_arr)
+        }
+    
+    def _run_prepared(self, series: Dict, strategy: Callable, strategy_name: str,
+                      symbol: str, parameters: Dict) -> BacktestResult:
+        """Exécute un backtest sur des séries déjà préparées (voir _prepare_series)"""
+        prices = series['prices']
+        indicators = series['indicators']
+        self._rsi = indicators['rsi']
+        self._ma20 = indicators['ma20']
+        self._ma50 = indicators['ma50']
+        self._prices = prices
+        
+        signals = self._compute_signals(series['prices_arr'], indicators, strategy,
+                                        parameters, symbol)
+        self._simulate(series, signals)
+        
+        # Calculer les métriques
+        return self._calculate_metrics(
+            strategy_name, symbol, prices[0].timestamp, prices[-1].timestamp, parameters
+        )
+    
+    def _compute_signals(self, prices_arr: np.ndarray, indicators: Dict[str, np.ndarray],
+                         strategy: Callable, parameters: Dict, symbol: str) -> np.ndarray:
+        """
+        Signaux de la stratégie pour chaque barre (+1 achat, -1 vente, 0 sinon)
+        
+        Les signaux ne dépendent pas de l'état du portefeuille : une stratégie
+        vectorisée est appelée une seule fois sur les séries complètes, une
+        stratégie classique barre par barre avec des indicateurs lus en O(1).
+        """
+        if not getattr(strategy, 'vectorized', False):
+            return self._collect_signals(strategy, symbol, len(prices_arr), parameters)
+        
+        try:
+            return np.asarray(strategy(prices_arr, indicators, parameters), dtype=np.int8)
+        except Exception as e:
+            print(f"⚠️ Erreur stratégie: {e}")
+            return np.zeros(len(prices_arr), dtype=np.int8)
+    
+    def _simulate(self, series: Dict, signals: np.ndarray):
+        """Simule le trading sur les signaux et remplit trades et courbe d'équité"""
+        prices_arr = series['prices_arr']
+        n_bars = len(prices_arr)
+        
+        # Noyau compilé si numba est disponible
+        (equity, cash_curve, position_curve, trade_bars, trade_sides,
+         trade_amounts, trade_totals, trade_fees) = _simulate_kernel(
+            np.ascontiguousarray(prices_arr, dtype=np.float64),
+            np.ascontiguousarray(signals, dtype=np.int8),
+            float(self.initial_capital), float(self.fee_pct)
+        )
+        
+        n_points = len(equity)
+        self._eq_ts = np.empty(n_points, dtype=np.int64)
+        self._eq_ts[:n_bars] = series['timestamps_ns']
+        self._eq_ts[n_bars:] = self._eq_ts[n_bars - 1]  # Point de liquidation finale
+        self._tz = series['tz']
+        self._eq_equity = equity
+        self._eq_cash = cash_curve
+        self._eq_pos = position_curve
+        self._eq_len = n_points
+        
+        # Journal des trades rempli colonne par colonne, sans objet par trade
+        trade_log = np.empty(len(trade_bars), dtype=_TRADE_DTYPE)
+        trade_log['ts_ns'] = series['timestamps_ns'][trade_bars]
+        trade_log['side'] = trade_sides
+        trade_log['price'] = prices_arr[trade_bars]
+        trade_log['amount'] = trade_amounts
+        trade_log['total'] = trade_totals
+        trade_log['fee'] = trade_fees
+        trade_log['reason'] = np.where(
+            trade_sides == _SIDE_BUY, "Signal: BUY",
+            np.where(trade_sides == _SIDE_SELL, "Signal: SELL", "Fin du backtest")
+        ).astype(object)
+        self._trade_log = trade_log
+        self._n_trades = len(trade_log)
+        
+        self.cash = float(cash_curve[-1])
+        self.position_value = float(position_curve[-1])
+        self.equity = float(equity[-1])
+        self.position_size = 0.0  # Toujours soldée en fin de backtest
+    
+    def compile_strategy(self,
+                         prices: List[CryptoPrice],
+                         strategy: Callable,
+                         strategy_name: str,
+                         symbol: str) -> Callable[[Optional[Dict]], BacktestResult]:
+        """
+        Spécialise un backtest sur des prix et une stratégie fixés
+        
+        Les séries (prix, horodatages, indicateurs) sont préparées une seule
+        fois ; seul le jeu de paramètres varie d'un appel à l'autre.
+        
+        Args:
+            prices: Historique des prix
+            strategy: Fonction de stratégie (classique ou vectorisée)
+            strategy_name: Nom de la stratégie
+            symbol: Symbole de la crypto
+        
+        Returns:
+            Fonction parameters -> BacktestResult
+        """
+        series = self._prepare_series(prices) if prices and len(prices) >= 2 else None
+        initial_capital = self.initial_capital
+        fee_pct = self.fee_pct
+        
+        def run(parameters: Optional[Dict] = None) -> BacktestResult:
+            engine = BacktestEngine(initial_capital, fee_pct)
+            if series is None:
+                return engine._create_empty_result(strategy_name, symbol)
+            return engine._run_prepared(series, strategy, strategy_name, symbol,
+                                        parameters or {})
+        
+        return run
+    
+    def run_sweep(self,
+                  prices: List[CryptoPrice],
+                  strategy: Callable,
+                  strategy_name: str,
+                  symbol: str,
+                  param_grid: List[Dict],
+                  n_workers: Optional[int] = None) -> List[BacktestResult]:
+        """
+        Exécute un backtest par jeu de paramètres, en parallèle sur plusieurs processus
+        
+        Args:
+            prices: Historique des prix (envoyé une seule fois à chaque worker)
+            strategy: Stratégie (fonction de module, pour être picklable)
+            strategy_name: Nom de la stratégie
+            symbol: Symbole de la crypto
+            param_grid: Liste des jeux de paramètres à tester
+            n_workers: Nombre de processus (défaut: nombre de cœurs)
+        
+        Returns:
+            Un BacktestResult par jeu de paramètres, dans l'ordre de param_grid
+        """
+        if not param_grid:
+            return []
+        
+        init_args = (self.initial_capital, self.fee_pct, prices,
+                     strategy, strategy_name, symbol)
+        
+        if n_workers == 1 or len(param_grid) == 1:
+            _init_sweep_worker(*init_args)
+            return [_run_sweep_job(params) for params in param_grid]
+        
+        with ProcessPoolExecutor(max_workers=n_workers,
+                                 initializer=_init_sweep_worker,
+                                 initargs=init_args) as executor:
+            return list(executor.map(_run_sweep_job, param_grid))
+    
+    def _collect_signals(self, strategy: Callable, symbol: str, n_bars: int,
+                         parameters: Dict) -> np.ndarray:
+        """
+        Appelle une stratégie barre par barre et encode ses signaux en int8
+        
+        Une stratégie peut déclarer `needs_history = False` ou
+        `needs_indicators = False` : le MarketData construit à chaque barre
+        omet alors l'historique des prix ou les indicateurs.
+        """
+        with_history = getattr(strategy, 'needs_history', True)
+        with_indicators = getattr(strategy, 'needs_indicators', True)
+        
+        signals = np.zeros(n_bars, dtype=np.int8)
+        for i in range(n_bars):
             # Créer MarketData simplifié pour la stratégie
-            market_data = self._create_market_data_from_history(prices[:i+1], symbol)
+            market_data = self._build_market_data(i, symbol, with_history, with_indicators)
             
             # Obtenir le signal de la stratégie
             try:
-                signal = strategy(market_data, parameters or {})
+                signal = strategy(market_data, parameters)
             except Exception as e:
                 print(f"⚠️ Erreur stratégie: {e}")
                 signal = 'HOLD'
             
-            # Exécuter le signal
-            if signal == 'BUY' and self.cash > 0:
-                # Acheter avec tout le cash
-                self.buy(current_price, self.cash / current_price, timestamp, 
-                        reason=f"Signal: {signal}")
-            
-            elif signal == 'SELL' and self.position_size > 0:
-                # Vendre toute la position
-                self.sell(current_price, self.position_size, timestamp,
-                         reason=f"Signal: {signal}")
-            
-            # Mettre à jour l'équité
-            self.update_equity(current_price, timestamp)
-        
-        # Vendre toute position restante à la fin
-        if self.position_size > 0:
-            final_price = prices[-1].price_eur
-            self.sell(final_price, self.position_size, prices[-1].timestamp,
-                     reason="Fin du backtest")
-            self.update_equity(final_price, prices[-1].timestamp)
-        
-        # Calculer les métriques
-        return self._calculate_metrics(
-            strategy_name, symbol, start_date, end_date, parameters or {}
-        )
+            if signal == 'BUY':
+                signals[i] = _SIDE_BUY
+            elif signal == 'SELL':
+                signals[i] = _SIDE_SELL
+        return signals
     
-    def _create_market_data_from_history(self, prices: List[CryptoPrice], 
-                                        symbol: str) -> MarketData:
-        """Crée un MarketData à partir de l'historique"""
-        if not prices:
-            return None
-        
-        current_price = prices[-1]
+    @classmethod
+    def _precompute_indicators(cls, prices_arr: np.ndarray, rsi_period: int = 14) -> Dict[str, np.ndarray]:
+        """
+        Calcule RSI, MA20 et MA50 pour chaque barre en une passe vectorisée
         
-        # Calculer indicateurs techniques simplifiés
-        price_values = [p.price_eur for p in prices]
+        La valeur à l'indice i est celle qu'on obtiendrait sur prices[:i+1]
+        (mêmes conventions que le calcul barre par barre). Les séries restent
+        en float64 : les stratégies les comparent aux prix (float64), et un
+        arrondi float32 suffit à changer une égalité et donc un signal.
+        """
+        rsi = cls._calculate_rsi(prices_arr, rsi_period)
+        mas = cls._precompute_mas(prices_arr, windows=(20, 50))
         
-        rsi = self._calculate_rsi(price_values) if len(price_values) >= 14 else 50
-        ma20 = np.mean(price_values[-20:]) if len(price_values) >= 20 else price_values[-1]
-        ma50 = np.mean(price_values[-50:]) if len(price_values) >= 50 else price_values[-1]
+        return {'rsi': rsi, 'ma20': mas[20], 'ma50': mas[50]}
+    
+    @staticmethod
+    def _precompute_mas(prices_arr: np.ndarray, windows=(20, 50)) -> Dict[int, np.ndarray]:
+        """
+        Moyennes mobiles simples pour chaque fenêtre, en O(N) par fenêtre
         
-        ti = TechnicalIndicators(
-            rsi=rsi,
-            ma20=ma20,
-            ma50=ma50
-        )
+        Le noyau rolling de pandas met à jour une somme glissante
+        (V[t] = V[t-1] + (s[t] - s[t-w]) / w) au lieu de refaire la moyenne.
+        Tant que la fenêtre n'est pas pleine, la valeur est le prix courant.
+        """
+        series = pd.Series(prices_arr, dtype=float)
+        mas: Dict[int, np.ndarray] = {}
+        for window in windows:
+            ma = series.rolling(window).mean().to_numpy()
+            mas[window] = np.where(np.isnan(ma), prices_arr, ma)
+        return mas
+    
+    def _build_market_data(self, i: int, symbol: str, with_history: bool = True,
+                           with_indicators: bool = True) -> MarketData:
+        """Crée le MarketData de la barre i à partir des données précalculées"""
+        if with_indicators:
+            ti = TechnicalIndicators(
+                rsi=float(self._rsi[i]),
+                ma20=float(self._ma20[i]),
+                ma50=float(self._ma50[i])
+            )
+        else:
+            ti = TechnicalIndicators()
         
         return MarketData(
             symbol=symbol,
-            current_price=current_price,
+            current_price=self._prices[i],
             technical_indicators=ti,
-            price_history=prices
+            price_history=_PriceHistoryView(self._prices, i + 1) if with_history else []
         )
     
-    def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
-        """Calcule le RSI"""
-        if len(prices) < period + 1:
-            return 50.0
+    @staticmethod
+    def _calculate_rsi(prices, period: int = 14) -> np.ndarray:
+        """
+        Calcule la série RSI complète (rsi[i] = RSI de prices[:i+1])
         
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        gains = [d if d > 0 else 0 for d in deltas]
-        losses = [-d if d < 0 else 0 for d in deltas]
+        Accepte une liste ou un np.ndarray. Les barres sans assez
+        d'historique valent 50.
+        """
+        prices = np.asarray(prices, dtype=float)
+        rsi = np.full(prices.shape[0], 50.0)
+        if prices.shape[0] < period + 1:
+            return rsi
         
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:])
+        deltas = np.diff(prices)
+        gains = np.maximum(deltas, 0.0)
+        losses = np.maximum(-deltas, 0.0)
         
-        if avg_loss == 0:
-            return 100.0
+        # Lissage de Wilder : avg = (avg_prec * (period - 1) + courant) / period
+        alpha = 1.0 / period
+        avg_gain = pd.Series(gains).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+        avg_loss = pd.Series(losses).ewm(alpha=alpha, adjust=False).mean().to_numpy()
         
-        rs = avg_gain / avg_loss
-        return 100 - (100 / (1 + rs))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = 100 - (100 / (1 + avg_gain / avg_loss))
+        # avg_gain[k] couvre prices[:k+2] ; les `period` premières barres restent à 50
+        rsi[period:] = np.where(avg_loss == 0, 100.0, values)[period - 1:]
+        return rsi
     
     def _calculate_metrics(self, strategy_name: str, symbol: str,
                           start_date: datetime, end_date: datetime,
@@ -329,23 +798,22 @@ class BacktestEngine:
         # Max drawdown
         max_dd, max_dd_pct = self._calculate_max_drawdown()
         
-        # Stats de trading
-        winning_trades = [t for t in self.trades 
-                         if t.action == 'SELL' and self._is_winning_trade(t)]
-        losing_trades = [t for t in self.trades 
-                        if t.action == 'SELL' and not self._is_winning_trade(t)]
+        # Stats de trading : chaque vente est appariée au dernier achat en une passe
+        pnls, is_win = self._pair_trades()
+        win_pnls = pnls[is_win]
+        loss_pnls = pnls[~is_win]
         
-        total_trades = len([t for t in self.trades if t.action == 'SELL'])
-        num_wins = len(winning_trades)
-        num_losses = len(losing_trades)
+        total_trades = int(pnls.size)
+        num_wins = int(win_pnls.size)
+        num_losses = int(loss_pnls.size)
         
         win_rate = (num_wins / total_trades * 100) if total_trades > 0 else 0
         
-        avg_win = np.mean([self._calculate_trade_pnl(t) for t in winning_trades]) if winning_trades else 0
-        avg_loss = np.mean([self._calculate_trade_pnl(t) for t in losing_trades]) if losing_trades else 0
+        avg_win = win_pnls.mean() if num_wins else 0
+        avg_loss = loss_pnls.mean() if num_losses else 0
         
-        total_wins = sum([self._calculate_trade_pnl(t) for t in winning_trades])
-        total_losses = abs(sum([self._calculate_trade_pnl(t) for t in losing_trades]))
+        total_wins = win_pnls.sum()
+        total_losses = abs(loss_pnls.sum())
         profit_factor = (total_wins / total_losses) if total_losses > 0 else 0
         
         return BacktestResult(
@@ -368,103 +836,101 @@ class BacktestEngine:
             avg_win=avg_win,
             avg_loss=avg_loss,
             profit_factor=profit_factor,
-            trades=self.trades,
-            equity_curve=self.equity_curve,
-            parameters=parameters
+            trade_log=self._trade_log[:self._n_trades],
+            equity_timestamps=self._eq_ts[:self._eq_len],
+            equity_values=self._eq_equity[:self._eq_len],
+            equity_cash=self._eq_cash[:self._eq_len],
+            equity_position_value=self._eq_pos[:self._eq_len],
+            parameters=parameters,
+            tz=self._tz
         )
     
-    def _calculate_returns(self) -> List[float]:
+    def _calculate_returns(self) -> np.ndarray:
         """Calcule les rendements périodiques"""
-        if len(self.equity_curve) < 2:
-            return [0.0]
+        if self._eq_len < 2:
+            return np.zeros(1)
         
-        returns = []
-        for i in range(1, len(self.equity_curve)):
-            prev_equity = self.equity_curve[i-1]['equity']
-            curr_equity = self.equity_curve[i]['equity']
-            
-            if prev_equity > 0:
-                ret = (curr_equity - prev_equity) / prev_equity
-                returns.append(ret)
+        equity = self._eq_equity[:self._eq_len]
+        prev_equity = equity[:-1]
+        valid = prev_equity > 0
         
-        return returns if returns else [0.0]
+        returns = np.diff(equity)[valid] / prev_equity[valid]
+        return returns if returns.size else np.zeros(1)
     
-    def _calculate_sharpe_ratio(self, returns: List[float], 
+    def _calculate_sharpe_ratio(self, returns: np.ndarray, 
                                risk_free_rate: float = 0.02) -> float:
         """Calcule le Sharpe ratio"""
-        if not returns or len(returns) < 2:
+        returns = np.asarray(returns, dtype=float)
+        if returns.size < 2:
             return 0.0
         
-        excess_returns = [r - risk_free_rate / 252 for r in returns]  # 252 jours de trading
+        excess_returns = returns - risk_free_rate / 252  # 252 jours de trading
+        std = excess_returns.std()
         
-        if np.std(excess_returns) == 0:
+        if std == 0:
             return 0.0
         
-        return np.mean(excess_returns) / np.std(excess_returns) * np.sqrt(252)
+        return excess_returns.mean() / std * np.sqrt(252)
     
-    def _calculate_sortino_ratio(self, returns: List[float],
+    def _calculate_sortino_ratio(self, returns: np.ndarray,
                                  risk_free_rate: float = 0.02) -> float:
         """Calcule le Sortino ratio (uniquement downside risk)"""
-        if not returns or len(returns) < 2:
+        returns = np.asarray(returns, dtype=float)
+        if returns.size < 2:
             return 0.0
         
-        excess_returns = [r - risk_free_rate / 252 for r in returns]
-        downside_returns = [r for r in excess_returns if r < 0]
+        excess_returns = returns - risk_free_rate / 252
+        downside_returns = excess_returns[excess_returns < 0]
         
-        if not downside_returns or np.std(downside_returns) == 0:
+        if downside_returns.size == 0:
             return 0.0
         
-        return np.mean(excess_returns) / np.std(downside_returns) * np.sqrt(252)
+        downside_std = downside_returns.std()
+        if downside_std == 0:
+            return 0.0
+        
+        return excess_returns.mean() / downside_std * np.sqrt(252)
     
     def _calculate_max_drawdown(self) -> Tuple[float, float]:
         """Calcule le maximum drawdown"""
-        if not self.equity_curve:
+        if self._eq_len == 0:
             return 0.0, 0.0
         
-        equity_values = [e['equity'] for e in self.equity_curve]
-        peak = equity_values[0]
-        max_dd = 0.0
-        
-        for equity in equity_values:
-            if equity > peak:
-                peak = equity
-            
-            dd = peak - equity
-            if dd > max_dd:
-                max_dd = dd
+        equity = self._eq_equity[:self._eq_len]
+        running_peak = np.maximum.accumulate(equity)
+        max_dd = float((running_peak - equity).max())
         
+        # Pourcentage rapporté au plus haut de toute la courbe (convention historique)
+        peak = float(running_peak[-1])
         max_dd_pct = (max_dd / peak * 100) if peak > 0 else 0
         
         return max_dd, max_dd_pct
     
-    def _is_winning_trade(self, sell_trade: BacktestTrade) -> bool:
-        """Détermine si un trade est gagnant"""
-        # Trouver le dernier achat avant cette vente
-        buy_trades = [t for t in self.trades 
-                     if t.action == 'BUY' and t.timestamp < sell_trade.timestamp]
-        
-        if not buy_trades:
-            return False
-        
-        last_buy = buy_trades[-1]
-        
-        return sell_trade.price > last_buy.price
-    
-    def _calculate_trade_pnl(self, sell_trade: BacktestTrade) -> float:
-        """Calcule le P&L d'un trade"""
-        # Trouver le dernier achat
-        buy_trades = [t for t in self.trades 
-                     if t.action == 'BUY' and t.timestamp < sell_trade.timestamp]
+    def _pair_trades(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apparie chaque vente au dernier achat qui la précède (O(T))
         
-        if not buy_trades:
-            return 0.0
+        Returns:
+            (P&L de chaque vente frais inclus, vente gagnante = prix de vente > prix d'achat)
+        """
+        log = self._trade_log[:self._n_trades]
+        is_buy = log['side'] == _SIDE_BUY
         
-        last_buy = buy_trades[-1]
+        # Indice du dernier achat vu à chaque ordre (-1 si aucun)
+        last_buy = np.maximum.accumulate(np.where(is_buy, np.arange(len(log)), -1))
+        sells = ~is_buy
+        buy_idx = last_buy[sells]
+        has_buy = buy_idx >= 0
+        buy_idx = np.where(has_buy, buy_idx, 0)
         
-        buy_cost = last_buy.total + last_buy.fee
-        sell_proceeds = sell_trade.total - sell_trade.fee
+        sold = log[sells]
+        bought = log[buy_idx] if len(log) else log
+        buy_cost = bought['total'] + bought['fee']
+        sell_proceeds = sold['total'] - sold['fee']
         
-        return sell_proceeds - buy_cost
+        pnls = np.where(has_buy, sell_proceeds - buy_cost, 0.0)
+        wins = has_buy & (sold['price'] > bought['price'])
+        return pnls.astype(float), wins
     
     def _create_empty_result(self, strategy_name: str, symbol: str) -> BacktestResult:
         """Crée un résultat vide pour les cas d'erreur"""
@@ -504,6 +970,9 @@ def rsi_strategy(market_data: MarketData, params: Dict) -> str:
     return 'HOLD'
 
 
+rsi_strategy.needs_history = False
+
+
 def ma_crossover_strategy(market_data: MarketData, params: Dict) -> str:
     """
     Stratégie de croisement de moyennes mobiles
@@ -527,3 +996,33 @@ def ma_crossover_strategy(market_data: MarketData, params: Dict) -> str:
         return 'SELL'
     
     return 'HOLD'
+
+
+# Variantes vectorisées : (prix, indicateurs, params) -> signaux int8 (+1/0/-1)
+def rsi_strategy_vec(prices: np.ndarray, indicators: Dict[str, np.ndarray],
+                     params: Dict) -> np.ndarray:
+    """Version vectorisée de rsi_strategy (mêmes paramètres)"""
+    rsi = indicators['rsi']
+    oversold = params.get('oversold', 30)
+    overbought = params.get('overbought', 70)
+    
+    return np.where(rsi < oversold, 1, np.where(rsi > overbought, -1, 0)).astype(np.int8)
+
+
+rsi_strategy_vec.vectorized = True
+
+
+def ma_crossover_strategy_vec(prices: np.ndarray, indicators: Dict[str, np.ndarray],
+                              params: Dict) -> np.ndarray:
+    """Version vectorisée de ma_crossover_strategy"""
+    ma20 = indicators['ma20']
+    ma50 = indicators['ma50']
+    
+    buy = (ma20 > ma50) & (prices > ma20)
+    sell = (ma20 < ma50) & (prices < ma20)
+    signals = np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8)
+    signals[:1] = 0  # Comme la version scalaire : pas de signal sans historique
+    return signals
+
+
+ma_crossover_strategy_vec.vectorized = True
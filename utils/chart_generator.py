@@ -1,21 +1,29 @@
 """
 Module de graphiques avancés - Tendance 7 jours
+
+matplotlib est importé au premier graphique généré et non au chargement du
+module, comme dans ChartService.
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.figure import Figure
-from datetime import datetime, timedelta, timezone, timezone
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional
 import io
+import numpy as np
 from core.models import CryptoPrice, MarketData
+from utils.chart_utils import add_bars, downsample_indices, figure_to_png, price_columns
 
 
 class ChartGenerator:
     """Générateur de graphiques avancés"""
     
-    def __init__(self, dark_mode: bool = True):
+    def __init__(self, dark_mode: bool = True, max_points: int = 600):
+        """
+        Args:
+            dark_mode: Thème sombre
+            max_points: Nombre de points au-delà duquel les courbes sont décimées
+        """
         self.dark_mode = dark_mode
+        self.max_points = max_points
         self.bg_color = '#2b2b2b' if dark_mode else 'white'
         self.text_color = 'white' if dark_mode else 'black'
     
@@ -36,7 +44,12 @@ class ChartGenerator:
         Returns:
             BytesIO contenant l'image PNG
         """
+        import matplotlib.dates as mdates
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        
         fig = Figure(figsize=(14, 8), facecolor=self.bg_color)
+        FigureCanvasAgg(fig)  # Rendu Agg direct, sans pyplot
         
         # 2 subplots: Prix + Volume
         ax1 = fig.add_subplot(2, 1, 1, facecolor=self.bg_color)
@@ -44,17 +57,21 @@ class ChartGenerator:
         
         # Filtrer 7 derniers jours
         cutoff = datetime.now(timezone.utc) - timedelta(days=7)
-        recent_prices = [p for p in price_history if p.timestamp >= cutoff]
+        columns = price_columns(price_history)
+        recent = columns.dates >= mdates.date2num(cutoff)
         
-        if not recent_prices:
+        if not recent.any():
             return None
         
-        timestamps = [p.timestamp for p in recent_prices]
-        prices = [p.price_eur for p in recent_prices]
-        volumes = [p.volume_24h for p in recent_prices]
+        dates = columns.dates[recent]
+        prices = columns.prices[recent]
+        volumes = columns.volumes[recent]
+        
+        # Points des courbes (statistiques, indicateurs et volumes sur toute la série)
+        shown = downsample_indices(prices, self.max_points)
         
         # === GRAPHIQUE PRIX ===
-        ax1.plot(timestamps, prices, linewidth=2, color='#00BCD4', 
+        ax1.plot(dates[shown], prices[shown], linewidth=2, color='#00BCD4', 
                 label='Prix', marker='o', markersize=2, alpha=0.8)
         
         # Moyennes mobiles
@@ -62,11 +79,13 @@ class ChartGenerator:
             ma20 = self._moving_average(prices, 20)
             ma50 = self._moving_average(prices, 50) if len(prices) >= 50 else None
             
-            ax1.plot(timestamps[-len(ma20):], ma20, '--', 
+            ma20_shown = downsample_indices(ma20, self.max_points)
+            ax1.plot(dates[-len(ma20):][ma20_shown], np.asarray(ma20)[ma20_shown], '--', 
                     color='#FFC107', linewidth=1.5, label='MA20', alpha=0.7)
             
             if ma50:
-                ax1.plot(timestamps[-len(ma50):], ma50, '--',
+                ma50_shown = downsample_indices(ma50, self.max_points)
+                ax1.plot(dates[-len(ma50):][ma50_shown], np.asarray(ma50)[ma50_shown], '--',
                         color='#FF5722', linewidth=1.5, label='MA50', alpha=0.7)
         
         # Support/Résistance
@@ -83,7 +102,7 @@ class ChartGenerator:
         current_price = prices[-1]
         ax1.axhline(y=current_price, color='white', linestyle='--', 
                    linewidth=1, alpha=0.5)
-        ax1.text(timestamps[-1], current_price, f' {current_price:.2f}€', 
+        ax1.text(dates[-1], current_price, f' {current_price:.2f}€', 
                 color='white', va='center', fontweight='bold')
         
         # Styling prix
@@ -96,17 +115,17 @@ class ChartGenerator:
         ax1.tick_params(colors=self.text_color)
         
         # === GRAPHIQUE VOLUME ===
-        colors = ['green' if prices[i] >= prices[i-1] else 'red' 
-                 for i in range(1, len(prices))]
-        colors.insert(0, 'gray')
+        colors = np.concatenate((['gray'], np.where(prices[1:] >= prices[:-1], 'green', 'red')))
         
-        ax2.bar(timestamps, volumes, color=colors, alpha=0.6, width=0.003)
+        add_bars(ax2, dates, volumes, width=0.003, colors=colors, alpha=0.6)
         ax2.set_ylabel('Volume 24h', color=self.text_color, fontsize=12)
         ax2.set_xlabel('Date', color=self.text_color, fontsize=12)
         ax2.tick_params(colors=self.text_color)
         ax2.grid(True, alpha=0.3, color='gray', axis='y')
         
         # Format dates
+        ax1.xaxis_date()
+        ax2.xaxis_date()
         ax1.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m'))
         ax2.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m %Hh'))
         fig.autofmt_xdate()
@@ -126,14 +145,11 @@ class ChartGenerator:
                 bbox=dict(boxstyle='round', facecolor=self.bg_color, 
                          edgecolor=self.text_color, alpha=0.8))
         
-        plt.tight_layout()
+        # Marges fixes : pas de passe de rendu supplémentaire pour les calculer
+        fig.subplots_adjust(left=0.07, right=0.94, top=0.86, bottom=0.12, hspace=0.2)
         
         # Sauvegarder en BytesIO
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', facecolor=self.bg_color, 
-                   edgecolor='none', dpi=100, bbox_inches='tight')
-        buf.seek(0)
-        plt.close(fig)
+        buf = figure_to_png(fig, self.bg_color)
         
         return buf
     
@@ -150,7 +166,12 @@ class ChartGenerator:
         Returns:
             BytesIO contenant l'image PNG
         """
+        import matplotlib.dates as mdates
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        
         fig = Figure(figsize=(12, 7), facecolor=self.bg_color)
+        FigureCanvasAgg(fig)  # Rendu Agg direct, sans pyplot
         ax = fig.add_subplot(111, facecolor=self.bg_color)
         
         colors = ['#00BCD4', '#4CAF50', '#FF9800', '#9C27B0', '#F44336']
@@ -164,11 +185,13 @@ class ChartGenerator:
                 continue
             
             # Normaliser à 100 pour comparaison
-            prices = [p.price_eur for p in data.price_history]
-            normalized = [(p / prices[0]) * 100 for p in prices]
-            timestamps = [p.timestamp for p in data.price_history]
+            columns = price_columns(data.price_history)
+            normalized = columns.prices / columns.prices[0] * 100
+            shown = downsample_indices(normalized, self.max_points)
+            dates = columns.dates[shown]
+            normalized = normalized[shown]
             
-            ax.plot(timestamps, normalized, linewidth=2, 
+            ax.plot(dates, normalized, linewidth=2, 
                    color=colors[i % len(colors)], 
                    label=symbol, marker='o', markersize=2, alpha=0.8)
         
@@ -184,28 +207,22 @@ class ChartGenerator:
                  edgecolor=self.text_color, labelcolor=self.text_color)
         ax.grid(True, alpha=0.3, color='gray')
         ax.tick_params(colors=self.text_color)
+        ax.xaxis_date()
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m'))
         
-        plt.tight_layout()
+        fig.subplots_adjust(left=0.08, right=0.97, top=0.93, bottom=0.1)
         
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', facecolor=self.bg_color, 
-                   edgecolor='none', dpi=100, bbox_inches='tight')
-        buf.seek(0)
-        plt.close(fig)
+        buf = figure_to_png(fig, self.bg_color)
         
         return buf
     
     def _moving_average(self, prices: List[float], period: int) -> List[float]:
-        """Calcule moyenne mobile"""
+        """Calcule moyenne mobile (une valeur par fenêtre complète)"""
         if len(prices) < period:
             return []
         
-        ma = []
-        for i in range(period - 1, len(prices)):
-            ma.append(sum(prices[i-period+1:i+1]) / period)
-        
-        return ma
+        window = np.full(period, 1.0 / period)
+        return np.convolve(np.asarray(prices, dtype=float), window, mode='valid').tolist()
     
     def _find_support(self, prices: List[float]) -> float:
         """Trouve support"""
@@ -0,0 +1,157 @@
+"""
+Utilitaires communs aux graphiques matplotlib
+
+matplotlib n'est importé qu'au premier tracé : importer ce module (et les
+services qui en dépendent) reste léger tant qu'aucun graphique n'est généré.
+"""
+
+from io import BytesIO
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.models import CryptoPrice
+
+if TYPE_CHECKING:
+    from matplotlib.collections import PolyCollection
+
+
+class PriceColumns(NamedTuple):
+    """Colonnes extraites d'un historique de prix (tableaux en lecture seule)"""
+    timestamps: np.ndarray
+    dates: np.ndarray  # Horodatages convertis en nombres de jours matplotlib
+    prices: np.ndarray
+    volumes: np.ndarray
+
+
+# Colonnes des derniers historiques convertis, éviction FIFO
+_COLUMNS_CACHE: Dict[Tuple, Tuple[List[CryptoPrice], PriceColumns]] = {}
+_COLUMNS_CACHE_SIZE = 8
+
+
+def price_columns(prices: List[CryptoPrice]) -> PriceColumns:
+    """
+    Extrait horodatages (datetimes et dates matplotlib), prix EUR et volumes d'un historique
+
+    Le résultat est mémorisé pour les derniers historiques vus : plusieurs
+    graphiques tracés sur la même liste ne la parcourent qu'une fois. La clé
+    (identité, longueur, dernier horodatage) invalide l'entrée si la liste
+    a été complétée entre-temps.
+    """
+    key = (id(prices), len(prices), prices[-1].timestamp if prices else None)
+    cached = _COLUMNS_CACHE.get(key)
+    if cached is not None and cached[0] is prices:
+        return cached[1]
+
+    import matplotlib.dates as mdates
+
+    # Une compréhension par colonne : plus rapide ici qu'une passe unique via
+    # operator.attrgetter (tuples puis tableau object intermédiaire à convertir)
+    timestamps = np.array([p.timestamp for p in prices], dtype=object)
+    columns = PriceColumns(
+        timestamps=timestamps,
+        # Conversion faite une fois : les tracés reçoivent des flottants et
+        # ne repassent pas chacun par le convertisseur d'unités de matplotlib
+        dates=np.asarray(mdates.date2num(timestamps), dtype=float),
+        prices=np.array([p.price_eur for p in prices], dtype=float),
+        volumes=np.array([p.volume_24h for p in prices], dtype=float)
+    )
+    for column in columns:
+        column.flags.writeable = False
+
+    if len(_COLUMNS_CACHE) >= _COLUMNS_CACHE_SIZE:
+        del _COLUMNS_CACHE[next(iter(_COLUMNS_CACHE))]
+    # La liste est conservée avec ses colonnes : son id ne peut pas être réutilisé
+    _COLUMNS_CACHE[key] = (prices, columns)
+    return columns
+
+
+def downsample_indices(values: Sequence[float], max_points: int) -> np.ndarray:
+    """
+    Indices des points à tracer pour une courbe d'au plus ~max_points points
+
+    La série est découpée en max_points // 2 tranches consécutives dont on
+    garde le minimum et le maximum (plus le premier et le dernier point) :
+    l'enveloppe visible de la courbe est conservée, contrairement à un
+    simple pas fixe. Sous le seuil, tous les indices sont retournés.
+    """
+    n = len(values)
+    if max_points <= 0 or n <= max_points:
+        return np.arange(n)
+
+    n_buckets = max(1, max_points // 2)
+    buckets = np.arange(n) * n_buckets // n
+    edges = np.searchsorted(buckets, np.arange(n_buckets + 1))
+
+    # Tri par tranche puis par valeur : min en tête de tranche, max en fin
+    order = np.lexsort((np.asarray(values, dtype=float), buckets))
+    keep = np.concatenate((order[edges[:-1]], order[edges[1:] - 1], [0, n - 1]))
+    return np.unique(keep)
+
+
+def add_bars(ax, x, heights: Sequence[float], width: float, colors,
+             alpha: float = 1.0, label: Optional[str] = None) -> 'PolyCollection':
+    """
+    Trace des barres verticales en un seul artiste
+
+    Même rendu que ax.bar(x, heights, width=width) mais avec une seule
+    PolyCollection construite depuis des tableaux NumPy, au lieu d'un
+    Rectangle par barre.
+
+    Args:
+        ax: Axes matplotlib
+        x: Abscisses des centres (datetimes ou nombres)
+        heights: Hauteurs des barres
+        width: Largeur des barres (en jours pour des dates)
+        colors: Couleur unique ou une couleur par barre
+        alpha: Transparence
+        label: Libellé pour la légende
+
+    Returns:
+        La PolyCollection ajoutée
+    """
+    import matplotlib.dates as mdates
+    from matplotlib.collections import PolyCollection
+
+    x_values = np.asarray(x)
+    is_dates = x_values.dtype == object or np.issubdtype(x_values.dtype, np.datetime64)
+    if is_dates:
+        x_values = mdates.date2num(x_values)
+    x_values = x_values.astype(float)
+    heights = np.asarray(heights, dtype=float)
+
+    left = x_values - width / 2
+    right = x_values + width / 2
+    verts = np.zeros((len(x_values), 4, 2))
+    verts[:, 0, 0] = left
+    verts[:, 1, 0] = left
+    verts[:, 1, 1] = heights
+    verts[:, 2, 0] = right
+    verts[:, 2, 1] = heights
+    verts[:, 3, 0] = right
+
+    bars = PolyCollection(verts, facecolors=colors, edgecolors='none',
+                          alpha=alpha, label=label)
+    bars.sticky_edges.y.append(0)  # Comme ax.bar : pas de marge sous zéro
+    ax.add_collection(bars)
+
+    if is_dates:
+        ax.xaxis_date()
+    ax.autoscale_view()
+    return bars
+
+
+def figure_to_png(fig, facecolor: str, dpi: int = 100) -> BytesIO:
+    """
+    Encode une figure en PNG dans un BytesIO prêt à être lu
+
+    La mise en page doit déjà être fixée (pas de bbox_inches='tight', qui
+    impose une passe de rendu supplémentaire). La compression zlib
+    minimale encode nettement plus vite, pour des fichiers ~15 % plus
+    lourds, sans importance pour un envoi Telegram.
+    """
+    buf = BytesIO()
+    fig.savefig(buf, format='png', facecolor=facecolor, edgecolor='none', dpi=dpi,
+                pil_kwargs={'compress_level': 1})
+    buf.seek(0)
+    return buf
@@ -8,6 +8,9 @@ from typing import List, Dict, Any, Set
 from pathlib import Path
 import yaml
 
+# Parseur libyaml (C) si disponible, sinon parseur Python
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class NotificationConfigValidator:
     """Valide les fichiers de configuration de notifications"""
@@ -48,7 +51,7 @@ class NotificationConfigValidator:
         # Charger YAML
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YAML_LOADER)
         except yaml.YAMLError as e:
             self.errors.append(f"Erreur parsing YAML: {e}")
             return False